@@ -38,7 +38,17 @@
 #include <string.h>
 #include <stdlib.h>
 #include <ctype.h>
+#include <float.h>
 #include <math.h>
+#include <stddef.h>
+#include <stdint.h>
+
+#if defined(__SSE2__)
+#include <emmintrin.h>
+#endif
+#if defined(__AVX2__)
+#include <immintrin.h>
+#endif
 
 /*
  * Whitespace/Case handling for protocol parsing.
@@ -67,6 +77,68 @@ ascii_tolower(unsigned char c)
     return c;
 }
 
+/*
+ * Return a pointer to the first '\n' or '\r' in [p, end), or end if none.
+ *
+ * Line splitting touches every input byte, so this scans a vector at a time:
+ * 32 bytes with AVX2 (when the build targets it), 16 with SSE2 (always on
+ * x86-64), and 8 with a SWAR word test elsewhere. Each step compares against
+ * both terminators and jumps straight to the first hit via its bit mask. A
+ * scalar loop handles the tail.
+ */
+static inline const char *
+find_eol(const char *p, const char *end)
+{
+#if defined(__AVX2__)
+    const __m256i nl32 = _mm256_set1_epi8('\n');
+    const __m256i cr32 = _mm256_set1_epi8('\r');
+    while (end - p >= 32) {
+        __m256i v = _mm256_loadu_si256((const __m256i *)p);
+        unsigned int m = (unsigned int)_mm256_movemask_epi8(
+            _mm256_or_si256(_mm256_cmpeq_epi8(v, nl32), _mm256_cmpeq_epi8(v, cr32)));
+        if (m) {
+            return p + __builtin_ctz(m);
+        }
+        p += 32;
+    }
+#endif
+#if defined(__SSE2__)
+    const __m128i nl = _mm_set1_epi8('\n');
+    const __m128i cr = _mm_set1_epi8('\r');
+    while (end - p >= 16) {
+        __m128i v = _mm_loadu_si128((const __m128i *)p);
+        unsigned int m = (unsigned int)_mm_movemask_epi8(
+            _mm_or_si128(_mm_cmpeq_epi8(v, nl), _mm_cmpeq_epi8(v, cr)));
+        if (m) {
+            return p + __builtin_ctz(m);
+        }
+        p += 16;
+    }
+#elif defined(__BYTE_ORDER__) && __BYTE_ORDER__ == __ORDER_LITTLE_ENDIAN__
+    /*
+     * Classic "has zero byte" test on w ^ terminator. Borrows can only set
+     * spurious bits above a genuine match, so the lowest set bit is exact.
+     */
+    const uint64_t ones = 0x0101010101010101ULL;
+    const uint64_t highs = 0x8080808080808080ULL;
+    while (end - p >= 8) {
+        uint64_t w;
+        memcpy(&w, p, sizeof(w));
+        uint64_t a = w ^ (ones * '\n');
+        uint64_t b = w ^ (ones * '\r');
+        uint64_t m = (((a - ones) & ~a) | ((b - ones) & ~b)) & highs;
+        if (m) {
+            return p + (__builtin_ctzll(m) >> 3);
+        }
+        p += 8;
+    }
+#endif
+    while (p < end && *p != '\n' && *p != '\r') {
+        p++;
+    }
+    return p;
+}
+
 /*
  * Case-insensitive match between a raw buffer and a null-terminated key.
  * Also treats '-' as '_' to match normalized attribute names.
@@ -86,6 +158,130 @@ buffer_matches_key(const char *buf, size_t len, const char *key)
     return key[len] == '\0';  /* Ensure exact length match */
 }
 
+/*
+ * Fast paths for the numeric values that appear on almost every line
+ * (EXTINF durations, BANDWIDTH, sequence numbers). The general converters,
+ * PyLong_FromString() and PyOS_string_to_double(), need a NUL-terminated
+ * copy and handle bases, signs, exponents and underscores. Nearly all real
+ * values are short runs of digits, so those are decoded straight from the
+ * buffer and anything else falls back to the general path.
+ */
+
+/* Largest integer a double holds exactly: 2**53 */
+#define EXACT_DOUBLE_INT_MAX (1ULL << 53)
+
+/*
+ * Parse [s, s + len) if it is 1-18 ASCII digits (so it cannot overflow).
+ * Returns 1 and stores the value on success, 0 if the caller must fall back.
+ */
+static inline int
+parse_digits_fast(const char *s, Py_ssize_t len, uint64_t *out)
+{
+    if (len <= 0 || len > 18) {
+        return 0;
+    }
+    uint64_t v = 0;
+#if defined(__BYTE_ORDER__) && __BYTE_ORDER__ == __ORDER_LITTLE_ENDIAN__
+    /*
+     * Eight digits per step: validate every byte is '0'..'9', then combine
+     * pairs, quads and octets with three multiplies (first digit is the
+     * lowest byte on little-endian).
+     */
+    while (len >= 8) {
+        uint64_t w;
+        memcpy(&w, s, sizeof(w));
+        if (((w & 0xF0F0F0F0F0F0F0F0ULL) |
+             (((w + 0x0606060606060606ULL) & 0xF0F0F0F0F0F0F0F0ULL) >> 4))
+            != 0x3333333333333333ULL) {
+            return 0;
+        }
+        w -= 0x3030303030303030ULL;
+        w = (w * 10) + (w >> 8);
+        w = (((w & 0x000000FF000000FFULL) * (100 + (1000000ULL << 32))) +
+             (((w >> 16) & 0x000000FF000000FFULL) * (1 + (10000ULL << 32)))) >> 32;
+        v = v * 100000000ULL + w;
+        s += 8;
+        len -= 8;
+    }
+#endif
+    for (Py_ssize_t i = 0; i < len; i++) {
+        unsigned int d = (unsigned char)s[i] - '0';
+        if (d > 9) {
+            return 0;
+        }
+        v = v * 10 + d;
+    }
+    *out = v;
+    return 1;
+}
+
+/*
+ * Parse [s, s + len) if it is a plain decimal ("[+-]digits[.digits]", at
+ * least one digit, no exponent) whose digits fit an exactly representable
+ * mantissa and whose fraction has at most 22 digits. Then mantissa / 10**k
+ * is a single correctly rounded IEEE division of two exact values, which
+ * gives the same double as PyOS_string_to_double() (Clinger's fast path).
+ * Returns 1 on success, 0 if the caller must fall back.
+ */
+static inline int
+parse_decimal_fast(const char *s, Py_ssize_t len, double *out)
+{
+#if defined(FLT_EVAL_METHOD) && FLT_EVAL_METHOD == 0
+    static const double pow10[] = {
+        1e0, 1e1, 1e2, 1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9, 1e10, 1e11,
+        1e12, 1e13, 1e14, 1e15, 1e16, 1e17, 1e18, 1e19, 1e20, 1e21, 1e22,
+    };
+    Py_ssize_t i = 0;
+    int negative = 0;
+    if (len > 0 && (s[0] == '-' || s[0] == '+')) {
+        negative = (s[0] == '-');
+        i++;
+    }
+
+    uint64_t mantissa = 0;
+    int ndigits = 0;
+    int nfrac = 0;
+    int seen_dot = 0;
+    for (; i < len; i++) {
+        unsigned int d = (unsigned char)s[i] - '0';
+        if (d <= 9) {
+            if (++ndigits > 19) {
+                return 0;
+            }
+            mantissa = mantissa * 10 + d;
+            nfrac += seen_dot;
+        } else if (s[i] == '.' && !seen_dot) {
+            seen_dot = 1;
+        } else {
+            return 0;
+        }
+    }
+    if (ndigits == 0 || mantissa > EXACT_DOUBLE_INT_MAX || nfrac > 22) {
+        return 0;
+    }
+    double v = (double)mantissa / pow10[nfrac];
+    *out = negative ? -v : v;
+    return 1;
+#else
+    /* Excess-precision FPUs could double-round; always use the slow path */
+    (void)s; (void)len; (void)out;
+    return 0;
+#endif
+}
+
+/*
+ * int(s) for a NUL-terminated value, or NULL with an exception set.
+ */
+static PyObject *
+long_from_cstr(const char *s)
+{
+    uint64_t v;
+    if (parse_digits_fast(s, (Py_ssize_t)strlen(s), &v)) {
+        return PyLong_FromUnsignedLongLong(v);
+    }
+    return PyLong_FromString(s, NULL, 10);
+}
+
 /*
  * Compatibility shims for Py_NewRef/Py_XNewRef (added in Python 3.10).
  * These make reference ownership more explicit at call sites.
@@ -156,6 +352,15 @@ static inline PyObject *dict_get_interned(PyObject *dict, PyObject *interned_key
 #define EXT_X_TILES "#EXT-X-TILES"
 #define EXT_X_BLACKOUT "#EXT-X-BLACKOUT"
 
+/*
+ * Size of the on-stack line buffer used by m3u8_parse(). Lines at least this
+ * long fall back to a heap buffer.
+ */
+#define LINE_BUF_STACK_SIZE 1024
+
+/* Upper bound on TAG_DISPATCH entries, for the per-module dispatch index. */
+#define MAX_TAG_DISPATCH 64
+
 /*
  * X-macro for interned strings.
  *
@@ -231,7 +436,67 @@ static inline PyObject *dict_get_interned(PyObject *dict, PyObject *interned_key
     X(str_stream_info, "stream_info") \
     X(str_parts, "parts") \
     X(str_iframe_stream_info, "iframe_stream_info") \
-    X(str_image_stream_info, "image_stream_info")
+    X(str_image_stream_info, "image_stream_info") \
+    /* Attribute keys (AttrParser schema names) */ \
+    X(str_assoc_language, "assoc_language") \
+    X(str_audio, "audio") \
+    X(str_autoselect, "autoselect") \
+    X(str_average_bandwidth, "average_bandwidth") \
+    X(str_bandwidth, "bandwidth") \
+    X(str_byterange_length, "byterange_length") \
+    X(str_byterange_start, "byterange_start") \
+    X(str_can_block_reload, "can_block_reload") \
+    X(str_can_skip_dateranges, "can_skip_dateranges") \
+    X(str_can_skip_until, "can_skip_until") \
+    X(str_channels, "channels") \
+    X(str_characteristics, "characteristics") \
+    X(str_class, "class") \
+    X(str_codecs, "codecs") \
+    X(str_cue, "cue") \
+    X(str_data_id, "data_id") \
+    X(str_default, "default") \
+    X(str_elapsedtime, "elapsedtime") \
+    X(str_end_date, "end_date") \
+    X(str_end_on_next, "end_on_next") \
+    X(str_forced, "forced") \
+    X(str_frame_rate, "frame_rate") \
+    X(str_group_id, "group_id") \
+    X(str_hdcp_level, "hdcp_level") \
+    X(str_hold_back, "hold_back") \
+    X(str_id, "id") \
+    X(str_image, "image") \
+    X(str_independent, "independent") \
+    X(str_instream_id, "instream_id") \
+    X(str_keyformat, "keyformat") \
+    X(str_keyformatversions, "keyformatversions") \
+    X(str_language, "language") \
+    X(str_last_msn, "last_msn") \
+    X(str_last_part, "last_part") \
+    X(str_layout, "layout") \
+    X(str_method, "method") \
+    X(str_name, "name") \
+    X(str_part_hold_back, "part_hold_back") \
+    X(str_part_target, "part_target") \
+    X(str_pathway_id, "pathway_id") \
+    X(str_planned_duration, "planned_duration") \
+    X(str_program_id, "program_id") \
+    X(str_recently_removed_dateranges, "recently_removed_dateranges") \
+    X(str_resolution, "resolution") \
+    X(str_scte35_cmd, "scte35_cmd") \
+    X(str_scte35_in, "scte35_in") \
+    X(str_scte35_out, "scte35_out") \
+    X(str_server_uri, "server_uri") \
+    X(str_skipped_segments, "skipped_segments") \
+    X(str_stable_rendition_id, "stable_rendition_id") \
+    X(str_stable_variant_id, "stable_variant_id") \
+    X(str_start_date, "start_date") \
+    X(str_subtitles, "subtitles") \
+    X(str_thumbnails, "thumbnails") \
+    X(str_time_offset, "time_offset") \
+    X(str_type, "type") \
+    X(str_value, "value") \
+    X(str_video, "video") \
+    X(str_video_range, "video_range")
 
 /*
  * Module state - holds all per-module data.
@@ -246,6 +511,17 @@ typedef struct {
     PyObject *datetime_cls;
     PyObject *timedelta_cls;
     PyObject *fromisoformat_meth;
+    PyObject *validate_func;  /* version_matching.validate, loaded on first strict parse */
+    PyObject *last_delta;     /* timedelta(seconds=last_delta_secs), see datetime_add_seconds */
+    PyObject *data_template;  /* Default result dict copied by init_parse_data */
+    double last_delta_secs;
+    /*
+     * Tag dispatch index (see init_tag_index): TAG_DISPATCH entry numbers
+     * grouped by tag_class_byte(), with tag_index_start[c] .. [c + 1]
+     * delimiting the candidates for class byte c.
+     */
+    unsigned char tag_index_start[257];
+    unsigned char tag_index[MAX_TAG_DISPATCH];
     /* Interned strings - generated from X-macro */
     #define DECLARE_INTERNED(name, str) PyObject *name;
     INTERNED_STRINGS(DECLARE_INTERNED)
@@ -266,6 +542,15 @@ typedef struct {
  * - Before calling custom_tags_parser (so callback sees current state)
  * - After custom_tags_parser returns (in case it modified state)
  * - At the end of parsing (for final state consistency)
+ *
+ * segment_flags holds the per-segment markers (EXT-X-DISCONTINUITY,
+ * EXT-X-CUE-IN, EXT-X-GAP, ...) that parser.py keeps as state keys until
+ * the next segment or part pops them. A set bit stands for a present key;
+ * the keys are only written to the state dict around custom_tags_parser.
+ *
+ * keys_has_none has no dict counterpart: it caches the result of the
+ * "None in data['keys']" check and is dropped whenever custom_tags_parser
+ * runs, since only a callback can take None back out of the list.
  */
 typedef struct {
     m3u8_state *mod_state;   /* Module state (borrowed) */
@@ -273,11 +558,49 @@ typedef struct {
     PyObject *state;         /* Parser state dict (owned) */
     int strict;              /* Strict parsing mode flag */
     int lineno;              /* Current line number (1-based) */
+    Py_ssize_t line_len;     /* Length of the tag line handed to handlers */
     /* Shadow state for hot flags - avoids dict lookups in main loop */
     int expect_segment;      /* Shadow of state["expect_segment"] */
     int expect_playlist;     /* Shadow of state["expect_playlist"] */
+    int keys_has_none;       /* None known to be in data["keys"] */
+    unsigned int segment_flags;  /* SEG_FLAG_* bits, see segment_flag_keys */
 } ParseContext;
 
+#define SEG_FLAG_DISCONTINUITY               (1u << 0)
+#define SEG_FLAG_CUE_IN                      (1u << 1)
+#define SEG_FLAG_CUE_OUT_START               (1u << 2)
+#define SEG_FLAG_CUE_OUT_EXPLICITLY_DURATION (1u << 3)
+#define SEG_FLAG_GAP                         (1u << 4)
+
+/* State dict key standing for each SEG_FLAG_* bit */
+static const struct {
+    unsigned int flag;
+    size_t key_offset;   /* offsetof(m3u8_state, str_...) */
+} segment_flag_keys[] = {
+    {SEG_FLAG_DISCONTINUITY, offsetof(m3u8_state, str_discontinuity)},
+    {SEG_FLAG_CUE_IN, offsetof(m3u8_state, str_cue_in)},
+    {SEG_FLAG_CUE_OUT_START, offsetof(m3u8_state, str_cue_out_start)},
+    {SEG_FLAG_CUE_OUT_EXPLICITLY_DURATION,
+     offsetof(m3u8_state, str_cue_out_explicitly_duration)},
+    {SEG_FLAG_GAP, offsetof(m3u8_state, str_gap)},
+};
+
+#define NUM_SEGMENT_FLAGS (sizeof(segment_flag_keys) / sizeof(segment_flag_keys[0]))
+
+static inline PyObject *
+segment_flag_key(m3u8_state *ms, size_t i)
+{
+    return *(PyObject **)((char *)ms + segment_flag_keys[i].key_offset);
+}
+
+/* Store Py_True (or Py_False/Py_None when unset) in dict[key] for one flag */
+static inline int
+set_segment_flag(PyObject *dict, PyObject *key, unsigned int flags,
+                 unsigned int flag, PyObject *unset)
+{
+    return dict_set_interned(dict, key, (flags & flag) ? Py_True : unset);
+}
+
 /*
  * Unified tag handler function type.
  *
@@ -300,7 +623,7 @@ typedef int (*TagHandler)(ParseContext *ctx, const char *line);
  * - Matches Python's DISPATCH dict pattern
  * - More maintainable and readable
  * - Easier to add/remove tags
- * - Linear scan is fast for <50 tags (comparable to dict lookup overhead)
+ * - Indexed by class byte, so each line checks only a few candidates
  */
 typedef struct {
     const char *tag;      /* Tag string, e.g., "#EXTINF" */
@@ -324,6 +647,17 @@ sync_shadow_to_dict(ParseContext *ctx)
                           ctx->expect_playlist ? Py_True : Py_False) < 0) {
         return -1;
     }
+    for (size_t i = 0; i < NUM_SEGMENT_FLAGS; i++) {
+        PyObject *key = segment_flag_key(mod_state, i);
+        if (ctx->segment_flags & segment_flag_keys[i].flag) {
+            if (dict_set_interned(ctx->state, key, Py_True) < 0) {
+                return -1;
+            }
+        } else if (dict_get_interned(ctx->state, key) != NULL &&
+                   PyDict_DelItem(ctx->state, key) < 0) {
+            return -1;
+        }
+    }
     return 0;
 }
 
@@ -341,6 +675,17 @@ sync_shadow_from_dict(ParseContext *ctx)
 
     val = dict_get_interned(ctx->state, mod_state->str_expect_playlist);
     ctx->expect_playlist = (val == Py_True);
+
+    /* Segment flags follow key presence, as with the old state keys */
+    ctx->segment_flags = 0;
+    for (size_t i = 0; i < NUM_SEGMENT_FLAGS; i++) {
+        if (dict_get_interned(ctx->state, segment_flag_key(mod_state, i)) != NULL) {
+            ctx->segment_flags |= segment_flag_keys[i].flag;
+        }
+    }
+
+    /* The callback may have edited or replaced data["keys"] */
+    ctx->keys_has_none = 0;
 }
 
 /* Forward declaration for module definition */
@@ -406,14 +751,14 @@ init_interned_strings(m3u8_state *state)
 }
 
 /*
- * Raise ParseError with lineno and line arguments.
+ * Raise ParseError with lineno and the line_len bytes at line as arguments.
  * Takes module state to get the ParseError class.
  *
  * Optimization: Uses direct tuple construction instead of Py_BuildValue
  * to avoid format string parsing overhead.
  */
 static void
-raise_parse_error(m3u8_state *state, int lineno, const char *line)
+raise_parse_error_len(m3u8_state *state, int lineno, const char *line, Py_ssize_t line_len)
 {
     /* Direct tuple construction - faster than Py_BuildValue("(is)", ...) */
     PyObject *py_lineno = PyLong_FromLong(lineno);
@@ -421,7 +766,7 @@ raise_parse_error(m3u8_state *state, int lineno, const char *line)
         return;
     }
 
-    PyObject *py_line = PyUnicode_FromString(line);
+    PyObject *py_line = PyUnicode_FromStringAndSize(line, line_len);
     if (py_line == NULL) {
         Py_DECREF(py_lineno);
         return;
@@ -443,44 +788,11 @@ raise_parse_error(m3u8_state *state, int lineno, const char *line)
     }
 }
 
-/*
- * remove_quotes(), implemented at the Python level as:
- *
- *   quotes = ('"', "'")
- *   if string.startswith(quotes) and string.endswith(quotes):
- *       return string[1:-1]
- *
- * Note the subtlety: Python does NOT require matching quote characters.
- * We mirror that behavior for parity.
- *
- * Returns: new reference.
- */
-static PyObject *
-remove_quotes_py(PyObject *str)
+/* raise_parse_error_len() for a NUL-terminated line */
+static void
+raise_parse_error(m3u8_state *state, int lineno, const char *line)
 {
-    if (!PyUnicode_Check(str)) {
-        PyErr_SetString(PyExc_TypeError, "expected str");
-        return NULL;
-    }
-
-    Py_ssize_t len = PyUnicode_GetLength(str);
-    if (len < 2) {
-        return Py_NewRef(str);
-    }
-
-    Py_UCS4 first = PyUnicode_ReadChar(str, 0);
-    if (first == (Py_UCS4)-1 && PyErr_Occurred()) {
-        return NULL;
-    }
-    Py_UCS4 last = PyUnicode_ReadChar(str, len - 1);
-    if (last == (Py_UCS4)-1 && PyErr_Occurred()) {
-        return NULL;
-    }
-
-    if ((first == '"' || first == '\'') && (last == '"' || last == '\'')) {
-        return PyUnicode_Substring(str, 1, len - 1);
-    }
-    return Py_NewRef(str);
+    raise_parse_error_len(state, lineno, line, (Py_ssize_t)strlen(line));
 }
 
 /*
@@ -529,6 +841,9 @@ dict_get_interned(PyObject *dict, PyObject *interned_key)
 /*
  * Get or create segment dict in state using interned string.
  * Returns borrowed reference on success, NULL with exception on failure.
+ *
+ * After a successful insert the state dict owns the new segment, so our
+ * pointer stays valid as a borrowed reference without a second lookup.
  */
 static PyObject *
 get_or_create_segment(m3u8_state *mod_state, PyObject *state)
@@ -541,12 +856,9 @@ get_or_create_segment(m3u8_state *mod_state, PyObject *state)
     if (segment == NULL) {
         return NULL;
     }
-    if (dict_set_interned(state, mod_state->str_segment, segment) < 0) {
-        Py_DECREF(segment);
-        return NULL;
-    }
+    int rc = dict_set_interned(state, mod_state->str_segment, segment);
     Py_DECREF(segment);
-    return dict_get_interned(state, mod_state->str_segment);
+    return rc < 0 ? NULL : segment;  /* borrowed from state */
 }
 
 /* Utility: build list like Python's content.strip().splitlines() (preserve internal blanks) */
@@ -562,27 +874,27 @@ static PyObject *build_stripped_splitlines(const char *content) {
 
     const unsigned char *line_start = p;
     while (p < end) {
-        if (*p == '\n' || *p == '\r') {
-            PyObject *line = PyUnicode_FromStringAndSize((const char *)line_start,
-                                                         (Py_ssize_t)(p - line_start));
-            if (!line) {
-                Py_DECREF(lines);
-                return NULL;
-            }
-            if (PyList_Append(lines, line) < 0) {
-                Py_DECREF(line);
-                Py_DECREF(lines);
-                return NULL;
-            }
+        p = (const unsigned char *)find_eol((const char *)p, (const char *)end);
+        if (p == end) {
+            break;
+        }
+        PyObject *line = PyUnicode_FromStringAndSize((const char *)line_start,
+                                                     (Py_ssize_t)(p - line_start));
+        if (!line) {
+            Py_DECREF(lines);
+            return NULL;
+        }
+        if (PyList_Append(lines, line) < 0) {
             Py_DECREF(line);
-
-            /* Consume newline sequence */
-            if (*p == '\r' && (p + 1) < end && *(p + 1) == '\n') p++;
-            p++;
-            line_start = p;
-            continue;
+            Py_DECREF(lines);
+            return NULL;
         }
+        Py_DECREF(line);
+
+        /* Consume newline sequence */
+        if (*p == '\r' && (p + 1) < end && *(p + 1) == '\n') p++;
         p++;
+        line_start = p;
     }
 
     /* Last line (even if empty) */
@@ -644,41 +956,83 @@ init_dict_fields(PyObject *data, PyObject **keys, size_t count)
     return 0;
 }
 
+/*
+ * Build the template init_parse_data copies: every result key in the order
+ * parser.py's data literal uses, with the scalar defaults filled in and
+ * None standing in for the lists and dicts each parse creates afresh.
+ *
+ * Returns: 0 on success, -1 on failure with exception set.
+ */
+static int
+init_data_template(m3u8_state *ms)
+{
+    PyObject *zero = PyLong_FromLong(0);
+    if (zero == NULL) {
+        return -1;
+    }
+    struct {
+        PyObject *key;
+        PyObject *value;   /* borrowed */
+    } defaults[] = {
+        {ms->str_media_sequence, zero},
+        {ms->str_is_variant, Py_False},
+        {ms->str_is_endlist, Py_False},
+        {ms->str_is_i_frames_only, Py_False},
+        {ms->str_is_independent_segments, Py_False},
+        {ms->str_is_images_only, Py_False},
+        {ms->str_playlist_type, Py_None},
+        {ms->str_playlists, Py_None},
+        {ms->str_segments, Py_None},
+        {ms->str_iframe_playlists, Py_None},
+        {ms->str_image_playlists, Py_None},
+        {ms->str_tiles, Py_None},
+        {ms->str_media, Py_None},
+        {ms->str_keys, Py_None},
+        {ms->str_rendition_reports, Py_None},
+        {ms->str_skip, Py_None},
+        {ms->str_part_inf, Py_None},
+        {ms->str_session_data, Py_None},
+        {ms->str_session_keys, Py_None},
+        {ms->str_segment_map, Py_None},
+    };
+
+    PyObject *template = PyDict_New();
+    if (template == NULL) {
+        Py_DECREF(zero);
+        return -1;
+    }
+    for (size_t i = 0; i < sizeof(defaults) / sizeof(defaults[0]); i++) {
+        if (dict_set_interned(template, defaults[i].key, defaults[i].value) < 0) {
+            Py_DECREF(template);
+            Py_DECREF(zero);
+            return -1;
+        }
+    }
+    Py_DECREF(zero);
+    ms->data_template = template;
+    return 0;
+}
+
 /*
  * Initialize the result data dictionary with default values.
  *
  * This sets up all the required keys with their initial values,
  * matching the structure created by the Python parser.
  *
- * Uses interned strings for faster dict operations (pointer comparison
- * instead of string hashing on each SetItem).
+ * The scalar defaults come from copying ms->data_template in one call;
+ * the mutable fields are then replaced with fresh containers, which
+ * keeps the key order and adds no new slots.
  *
  * Returns: New reference to data dict on success, NULL on failure.
  */
 static PyObject *
 init_parse_data(m3u8_state *ms)
 {
-    PyObject *data = PyDict_New();
+    PyObject *data = PyDict_Copy(ms->data_template);
     if (data == NULL) {
         return NULL;
     }
 
-    /* Set scalar defaults using interned keys */
-    PyObject *zero = PyLong_FromLong(0);
-    if (zero == NULL) goto fail;
-    if (dict_set_interned(data, ms->str_media_sequence, zero) < 0) {
-        Py_DECREF(zero);
-        goto fail;
-    }
-    Py_DECREF(zero);
-
-    if (dict_set_interned(data, ms->str_is_variant, Py_False) < 0) goto fail;
-    if (dict_set_interned(data, ms->str_is_endlist, Py_False) < 0) goto fail;
-    if (dict_set_interned(data, ms->str_is_i_frames_only, Py_False) < 0) goto fail;
-    if (dict_set_interned(data, ms->str_is_independent_segments, Py_False) < 0) goto fail;
-    if (dict_set_interned(data, ms->str_is_images_only, Py_False) < 0) goto fail;
-    if (dict_set_interned(data, ms->str_playlist_type, Py_None) < 0) goto fail;
-
     /* Initialize list fields using interned keys */
     PyObject *list_keys[] = {
         ms->str_playlists,
@@ -742,19 +1096,27 @@ fail:
 
 /*
  * Add seconds to a datetime object: dt + timedelta(seconds=secs)
+ *
+ * Segment durations are usually all the same, so the last timedelta is
+ * kept in module state and reused while secs does not change. The
+ * datetime C API is not part of the limited API, so building one means a
+ * full call into the timedelta type.
+ *
  * Returns new reference on success, NULL with exception on failure.
  */
 static PyObject *
 datetime_add_seconds(m3u8_state *state, PyObject *dt, double secs)
 {
-    PyObject *delta = PyObject_CallFunction(state->timedelta_cls, "id", 0, secs);
-    if (delta == NULL) {
-        return NULL;
+    if (state->last_delta == NULL || state->last_delta_secs != secs) {
+        PyObject *delta = PyObject_CallFunction(state->timedelta_cls, "id", 0, secs);
+        if (delta == NULL) {
+            return NULL;
+        }
+        Py_XDECREF(state->last_delta);
+        state->last_delta = delta;
+        state->last_delta_secs = secs;
     }
-
-    PyObject *new_dt = PyNumber_Add(dt, delta);
-    Py_DECREF(delta);
-    return new_dt;
+    return PyNumber_Add(dt, state->last_delta);
 }
 
 /*
@@ -828,22 +1190,6 @@ del_item_interned_ignore_keyerror(PyObject *dict, PyObject *interned_key)
     return -1;
 }
 
-/*
- * Helper: Transfer boolean flag from state to segment.
- *
- * Sets segment[key] = True if state[key] exists, False otherwise.
- * Deletes state[key] if it existed.
- * Returns 0 on success, -1 on failure.
- */
-static int
-transfer_state_bool(PyObject *state, PyObject *segment, PyObject *key)
-{
-    PyObject *val = PyDict_GetItem(state, key);  /* borrowed ref, no error */
-    if (PyDict_SetItem(segment, key, val ? Py_True : Py_False) < 0) return -1;
-    if (val && del_item_interned_ignore_keyerror(state, key) < 0) return -1;
-    return 0;
-}
-
 /*
  * Helper: Transfer value from state to segment (or None if missing).
  *
@@ -860,163 +1206,112 @@ transfer_state_value(PyObject *state, PyObject *segment, PyObject *key)
     return 0;
 }
 
+/* Parse a key/value attribute list with type conversion */
+typedef enum {
+    ATTR_STRING,
+    ATTR_INT,
+    ATTR_FLOAT,
+    ATTR_QUOTED_STRING,
+    ATTR_BANDWIDTH
+} AttrType;
+
+typedef struct {
+    const char *name;
+    AttrType type;
+    size_t key_offset;  /* offsetof(m3u8_state, <interned key>) */
+    int intern_value;   /* Intern string values (small, repeated value set) */
+} AttrParser;
+
 /*
- * Zero-copy attribute list parser.
- *
- * Parses "KEY=value,KEY2=value2" format directly from buffer pointers.
- * Creates Python objects directly without intermediate C string allocations.
- *
- * Args:
- *     start: Pointer to start of attribute list (after the ":" in the tag)
- *     end: Pointer to end of buffer
+ * Schema entry whose normalized key is the interned string str_<name>,
+ * so matched attributes share one key object instead of allocating a
+ * fresh one per occurrence.
+ */
+#define ATTR_KEY(name, type) {#name, type, offsetof(m3u8_state, str_##name), 0}
+
+/*
+ * As ATTR_KEY, for attributes whose values come from a small set that
+ * repeats across a playlist (METHOD, CODECS, GROUP-ID, INDEPENDENT, ...).
+ * String values are interned, so every occurrence shares one object.
+ */
+#define ATTR_INTERNED_KEY(name, type) {#name, type, offsetof(m3u8_state, str_##name), 1}
+
+static inline PyObject *
+attr_parser_key(m3u8_state *ms, const AttrParser *parser)
+{
+    return *(PyObject **)((char *)ms + parser->key_offset);
+}
+
+/*
+ * Convert a numeric attribute value (ATTR_INT, ATTR_BANDWIDTH or ATTR_FLOAT)
+ * held in [s, s + len). Mirrors int(), int(float()) and float() in the
+ * Python parser.
  *
- * Returns: New reference to dict, or NULL with exception set.
+ * Returns: New reference, or NULL with no exception set when the value is
+ * not a number and should be kept as a string.
  */
 static PyObject *
-parse_attribute_list_raw(const char *start, const char *end)
+number_from_buffer(AttrType type, const char *s, Py_ssize_t len)
 {
-    PyObject *attrs = PyDict_New();
-    if (attrs == NULL) {
-        return NULL;
-    }
+    uint64_t u;
+    double d;
+    PyObject *result = NULL;
 
-    const char *p = start;
-    while (p < end) {
-        /* Skip leading whitespace and commas */
-        while (p < end && (ascii_isspace((unsigned char)*p) || *p == ',')) {
-            p++;
-        }
-        if (p >= end) {
-            break;
-        }
-
-        /* Find key */
-        const char *key_start = p;
-        while (p < end && *p != '=' && *p != ',') {
-            p++;
+    if (type == ATTR_INT && parse_digits_fast(s, len, &u)) {
+        return PyLong_FromUnsignedLongLong(u);
+    }
+    if (type == ATTR_BANDWIDTH) {
+        if (parse_digits_fast(s, len, &u) && u <= EXACT_DOUBLE_INT_MAX) {
+            return PyLong_FromUnsignedLongLong(u);
         }
-        const char *key_end = p;
-
-        /* Create normalized key directly from buffer */
-        PyObject *py_key = create_normalized_key(key_start, key_end - key_start);
-        if (py_key == NULL) {
-            Py_DECREF(attrs);
-            return NULL;
-        }
-
-        PyObject *py_val = NULL;
-
-        if (p < end && *p == '=') {
-            p++;  /* Skip '=' */
-
-            if (p < end && (*p == '"' || *p == '\'')) {
-                /* Quoted string - include quotes in value for later processing */
-                char quote = *p;
-                const char *val_start = p;  /* Include opening quote */
-                p++;  /* Skip opening quote */
-                while (p < end && *p != quote) {
-                    p++;
-                }
-                if (p < end) {
-                    p++;  /* Include closing quote */
-                }
-                /* Create string with quotes (for compatibility with typed parser) */
-                py_val = PyUnicode_FromStringAndSize(val_start, p - val_start);
-            } else {
-                /* Unquoted value */
-                const char *val_start = p;
-                while (p < end && *p != ',') {
-                    p++;
-                }
-                /* Strip trailing whitespace from unquoted values */
-                const char *val_end = p;
-                while (val_end > val_start && ascii_isspace((unsigned char)*(val_end - 1))) {
-                    val_end--;
-                }
-                py_val = PyUnicode_FromStringAndSize(val_start, val_end - val_start);
-            }
-        } else {
-            /* Key without value - store the key content as value with empty key */
-            /* This handles formats like "EXT-X-CUE-OUT-CONT:2.436/120" */
-            Py_ssize_t key_len = key_end - key_start;
-            /* Strip trailing whitespace */
-            while (key_len > 0 && ascii_isspace((unsigned char)key_start[key_len - 1])) {
-                key_len--;
-            }
-            py_val = PyUnicode_FromStringAndSize(key_start, key_len);
-            Py_DECREF(py_key);
-            py_key = PyUnicode_FromString("");
-            if (py_key == NULL) {
-                Py_XDECREF(py_val);
-                Py_DECREF(attrs);
-                return NULL;
-            }
+        if (parse_decimal_fast(s, len, &d)) {
+            return PyLong_FromDouble(d);
         }
+    }
+    if (type == ATTR_FLOAT && parse_decimal_fast(s, len, &d)) {
+        return PyFloat_FromDouble(d);
+    }
 
-        if (py_val == NULL) {
-            Py_DECREF(py_key);
-            Py_DECREF(attrs);
-            return NULL;
-        }
+    char num_buf[64];
+    if (len >= (Py_ssize_t)sizeof(num_buf)) {
+        return NULL;
+    }
+    memcpy(num_buf, s, len);
+    num_buf[len] = '\0';
 
-        if (PyDict_SetItem(attrs, py_key, py_val) < 0) {
-            Py_DECREF(py_key);
-            Py_DECREF(py_val);
-            Py_DECREF(attrs);
-            return NULL;
+    if (type == ATTR_INT) {
+        result = PyLong_FromString(num_buf, NULL, 10);
+    } else {
+        d = PyOS_string_to_double(num_buf, NULL, NULL);
+        if (!(d == -1.0 && PyErr_Occurred())) {
+            result = (type == ATTR_BANDWIDTH) ? PyLong_FromDouble(d)
+                                              : PyFloat_FromDouble(d);
         }
-
-        Py_DECREF(py_key);
-        Py_DECREF(py_val);
     }
-
-    return attrs;
+    if (result == NULL) {
+        PyErr_Clear();
+    }
+    return result;
 }
 
 /*
- * Parse attribute list from a line like "PREFIX:KEY=value,KEY2=value2"
- *
- * This is a wrapper around parse_attribute_list_raw that handles the
- * prefix-skipping logic for compatibility with existing callers.
- *
- * Returns new reference to dict on success, NULL with exception on failure.
+ * remove_quotes() on a byte span: drop one leading and one trailing quote
+ * when both are present. Like the Python version, the two quote characters
+ * do not have to match. Quotes are ASCII, so testing bytes here is
+ * equivalent to testing code points on the decoded str.
  */
-static PyObject *
-parse_attribute_list(const char *line, const char *prefix)
+static inline void
+strip_quote_pair(const char **s, Py_ssize_t *len)
 {
-    /* Skip prefix if present */
-    const char *content = line;
-    if (prefix != NULL) {
-        size_t prefix_len = strlen(prefix);
-        if (strncmp(line, prefix, prefix_len) == 0) {
-            content = line + prefix_len;
-            if (*content == ':') {
-                content++;
-            }
-        } else {
-            /* Prefix not found - return empty dict */
-            return PyDict_New();
-        }
+    const char *v = *s;
+    Py_ssize_t n = *len;
+    if (n >= 2 && (v[0] == '"' || v[0] == '\'') &&
+        (v[n - 1] == '"' || v[n - 1] == '\'')) {
+        *s = v + 1;
+        *len = n - 2;
     }
-
-    /* Delegate to zero-copy implementation */
-    return parse_attribute_list_raw(content, content + strlen(content));
 }
 
-/* Parse a key/value attribute list with type conversion */
-typedef enum {
-    ATTR_STRING,
-    ATTR_INT,
-    ATTR_FLOAT,
-    ATTR_QUOTED_STRING,
-    ATTR_BANDWIDTH
-} AttrType;
-
-typedef struct {
-    const char *name;
-    AttrType type;
-} AttrParser;
-
 /*
  * Schema-aware attribute parser.
  *
@@ -1030,14 +1325,19 @@ typedef struct {
  * Args:
  *     start: Pointer to start of attribute list (after "TAG:")
  *     end: Pointer to end of content
- *     parsers: Array of AttrParser structs defining key->type mappings
+ *     ms: Module state holding the interned schema keys
+ *     parsers: Array of AttrParser structs defining key->type mappings, or
+ *              NULL to keep every value as a string
  *     num_parsers: Number of parsers in array
+ *     unquote: If true, apply remove_quotes() to ATTR_STRING values while
+ *              they are still byte spans (EXT-X-KEY and EXT-X-SESSION-KEY)
  *
  * Returns: New reference to dict on success, NULL with exception set.
  */
 static PyObject *
-parse_attributes_with_schema(const char *start, const char *end,
-                             const AttrParser *parsers, size_t num_parsers)
+parse_attributes_with_schema(m3u8_state *ms, const char *start, const char *end,
+                             const AttrParser *parsers, size_t num_parsers,
+                             int unquote)
 {
     PyObject *attrs = PyDict_New();
     if (attrs == NULL) {
@@ -1064,17 +1364,23 @@ parse_attributes_with_schema(const char *start, const char *end,
 
         /* Determine type via schema lookup BEFORE creating Python objects */
         AttrType type = ATTR_STRING;
+        int intern_value = 0;
+        PyObject *py_key = NULL;
         if (parsers != NULL) {
             for (size_t i = 0; i < num_parsers; i++) {
                 if (buffer_matches_key(key_start, key_len, parsers[i].name)) {
                     type = parsers[i].type;
+                    intern_value = parsers[i].intern_value;
+                    py_key = Py_NewRef(attr_parser_key(ms, &parsers[i]));
                     break;
                 }
             }
         }
 
-        /* Create normalized Python key only once, after schema lookup */
-        PyObject *py_key = create_normalized_key(key_start, key_len);
+        /* Schema misses still need a freshly normalized key */
+        if (py_key == NULL) {
+            py_key = create_normalized_key(key_start, key_len);
+        }
         if (py_key == NULL) {
             Py_DECREF(attrs);
             return NULL;
@@ -1111,46 +1417,18 @@ parse_attributes_with_schema(const char *start, const char *end,
                     Py_ssize_t full_len = has_closing_quote
                         ? (Py_ssize_t)((val_end - full_start) + 1)
                         : (Py_ssize_t)(val_end - full_start);
+                    if (unquote) {
+                        strip_quote_pair(&full_start, &full_len);
+                    }
                     py_val = PyUnicode_FromStringAndSize(full_start, full_len);
-                } else if (type == ATTR_INT || type == ATTR_BANDWIDTH) {
+                } else if (type == ATTR_INT || type == ATTR_BANDWIDTH ||
+                           type == ATTR_FLOAT) {
                     /* Numeric inside quotes - parse directly */
-                    char num_buf[64];
-                    if (val_len < (Py_ssize_t)sizeof(num_buf)) {
-                        memcpy(num_buf, val_start, val_len);
-                        num_buf[val_len] = '\0';
-                        if (type == ATTR_BANDWIDTH) {
-                            double v = PyOS_string_to_double(num_buf, NULL, NULL);
-                            if (v == -1.0 && PyErr_Occurred()) {
-                                PyErr_Clear();
-                            } else {
-                                py_val = PyLong_FromDouble(v);
-                            }
-                        } else {
-                            py_val = PyLong_FromString(num_buf, NULL, 10);
-                            if (py_val == NULL) {
-                                PyErr_Clear();
-                            }
-                        }
-                    }
+                    py_val = number_from_buffer(type, val_start, val_len);
                     /* Fallback to string if conversion fails */
                     if (py_val == NULL) {
                         py_val = PyUnicode_FromStringAndSize(val_start, val_len);
                     }
-                } else if (type == ATTR_FLOAT) {
-                    char num_buf[64];
-                    if (val_len < (Py_ssize_t)sizeof(num_buf)) {
-                        memcpy(num_buf, val_start, val_len);
-                        num_buf[val_len] = '\0';
-                        double v = PyOS_string_to_double(num_buf, NULL, NULL);
-                        if (v == -1.0 && PyErr_Occurred()) {
-                            PyErr_Clear();
-                            py_val = PyUnicode_FromStringAndSize(val_start, val_len);
-                        } else {
-                            py_val = PyFloat_FromDouble(v);
-                        }
-                    } else {
-                        py_val = PyUnicode_FromStringAndSize(val_start, val_len);
-                    }
                 } else {
                     py_val = PyUnicode_FromStringAndSize(val_start, val_len);
                 }
@@ -1168,49 +1446,11 @@ parse_attributes_with_schema(const char *start, const char *end,
                 Py_ssize_t val_len = val_end - val_start;
 
                 /* Direct type conversion - no intermediate Python string! */
-                if (type == ATTR_INT) {
-                    char num_buf[64];
-                    if (val_len < (Py_ssize_t)sizeof(num_buf)) {
-                        memcpy(num_buf, val_start, val_len);
-                        num_buf[val_len] = '\0';
-                        py_val = PyLong_FromString(num_buf, NULL, 10);
-                        if (py_val == NULL) {
-                            PyErr_Clear();
-                        }
-                    }
+                if (type == ATTR_INT || type == ATTR_BANDWIDTH || type == ATTR_FLOAT) {
+                    py_val = number_from_buffer(type, val_start, val_len);
                     if (py_val == NULL) {
                         py_val = PyUnicode_FromStringAndSize(val_start, val_len);
                     }
-                } else if (type == ATTR_BANDWIDTH) {
-                    char num_buf[64];
-                    if (val_len < (Py_ssize_t)sizeof(num_buf)) {
-                        memcpy(num_buf, val_start, val_len);
-                        num_buf[val_len] = '\0';
-                        double v = PyOS_string_to_double(num_buf, NULL, NULL);
-                        if (v == -1.0 && PyErr_Occurred()) {
-                            PyErr_Clear();
-                        } else {
-                            py_val = PyLong_FromDouble(v);
-                        }
-                    }
-                    if (py_val == NULL) {
-                        py_val = PyUnicode_FromStringAndSize(val_start, val_len);
-                    }
-                } else if (type == ATTR_FLOAT) {
-                    char num_buf[64];
-                    if (val_len < (Py_ssize_t)sizeof(num_buf)) {
-                        memcpy(num_buf, val_start, val_len);
-                        num_buf[val_len] = '\0';
-                        double v = PyOS_string_to_double(num_buf, NULL, NULL);
-                        if (v == -1.0 && PyErr_Occurred()) {
-                            PyErr_Clear();
-                            py_val = PyUnicode_FromStringAndSize(val_start, val_len);
-                        } else {
-                            py_val = PyFloat_FromDouble(v);
-                        }
-                    } else {
-                        py_val = PyUnicode_FromStringAndSize(val_start, val_len);
-                    }
                 } else {
                     /* ATTR_STRING or ATTR_QUOTED_STRING (unquoted case) */
                     py_val = PyUnicode_FromStringAndSize(val_start, val_len);
@@ -1218,11 +1458,16 @@ parse_attributes_with_schema(const char *start, const char *end,
             }
         } else {
             /* Key without value - store key content as value with empty key */
-            Py_ssize_t key_len = key_end - key_start;
-            while (key_len > 0 && ascii_isspace((unsigned char)key_start[key_len - 1])) {
-                key_len--;
+            /* This handles formats like "EXT-X-CUE-OUT-CONT:2.436/120" */
+            const char *val_start = key_start;
+            Py_ssize_t val_len = key_end - key_start;
+            while (val_len > 0 && ascii_isspace((unsigned char)val_start[val_len - 1])) {
+                val_len--;
             }
-            py_val = PyUnicode_FromStringAndSize(key_start, key_len);
+            if (unquote) {
+                strip_quote_pair(&val_start, &val_len);
+            }
+            py_val = PyUnicode_FromStringAndSize(val_start, val_len);
             Py_DECREF(py_key);
             py_key = PyUnicode_FromString("");
             if (py_key == NULL) {
@@ -1237,6 +1482,9 @@ parse_attributes_with_schema(const char *start, const char *end,
             Py_DECREF(attrs);
             return NULL;
         }
+        if (intern_value && PyUnicode_CheckExact(py_val)) {
+            PyUnicode_InternInPlace(&py_val);
+        }
 
         if (PyDict_SetItem(attrs, py_key, py_val) < 0) {
             Py_DECREF(py_key);
@@ -1256,8 +1504,9 @@ parse_attributes_with_schema(const char *start, const char *end,
  * Wrapper for parse_attributes_with_schema that handles prefix skipping.
  * This maintains backward compatibility with existing callers.
  */
-static PyObject *parse_typed_attribute_list(const char *line, const char *prefix,
-                                            const AttrParser *parsers, size_t num_parsers) {
+static PyObject *parse_prefixed_attribute_list(m3u8_state *ms, const char *line, const char *prefix,
+                                               const AttrParser *parsers, size_t num_parsers,
+                                               int unquote) {
     /* Skip prefix if present */
     const char *content = line;
     if (prefix != NULL) {
@@ -1274,221 +1523,211 @@ static PyObject *parse_typed_attribute_list(const char *line, const char *prefix
     }
 
     /* Delegate to schema-aware parser */
-    return parse_attributes_with_schema(content, content + strlen(content),
-                                        parsers, num_parsers);
+    return parse_attributes_with_schema(ms, content, content + strlen(content),
+                                        parsers, num_parsers, unquote);
+}
+
+/* Parse "PREFIX:KEY=value,..." converting values per the schema */
+static PyObject *parse_typed_attribute_list(m3u8_state *ms, const char *line, const char *prefix,
+                                            const AttrParser *parsers, size_t num_parsers) {
+    return parse_prefixed_attribute_list(ms, line, prefix, parsers, num_parsers, 0);
+}
+
+/* Parse "PREFIX:KEY=value,..." keeping every value as a string */
+static PyObject *parse_attribute_list(m3u8_state *ms, const char *line, const char *prefix,
+                                      int unquote) {
+    return parse_prefixed_attribute_list(ms, line, prefix, NULL, 0, unquote);
 }
 
+/*
+ * Key attribute parsers (EXT-X-KEY, EXT-X-SESSION-KEY). Every key value
+ * stays a string; the schema only marks the enumerated ones for interning.
+ */
+static const AttrParser key_parsers[] = {
+    ATTR_INTERNED_KEY(method, ATTR_STRING),
+    ATTR_INTERNED_KEY(keyformat, ATTR_STRING),
+    ATTR_INTERNED_KEY(keyformatversions, ATTR_STRING),
+};
+#define NUM_KEY_PARSERS (sizeof(key_parsers) / sizeof(key_parsers[0]))
+
 /* Stream info attribute parsers */
 static const AttrParser stream_inf_parsers[] = {
-    {"codecs", ATTR_QUOTED_STRING},
-    {"audio", ATTR_QUOTED_STRING},
-    {"video", ATTR_QUOTED_STRING},
-    {"video_range", ATTR_QUOTED_STRING},
-    {"subtitles", ATTR_QUOTED_STRING},
-    {"pathway_id", ATTR_QUOTED_STRING},
-    {"stable_variant_id", ATTR_QUOTED_STRING},
-    {"program_id", ATTR_INT},
-    {"bandwidth", ATTR_BANDWIDTH},
-    {"average_bandwidth", ATTR_INT},
-    {"frame_rate", ATTR_FLOAT},
-    {"hdcp_level", ATTR_STRING},
+    ATTR_INTERNED_KEY(codecs, ATTR_QUOTED_STRING),
+    ATTR_INTERNED_KEY(audio, ATTR_QUOTED_STRING),
+    ATTR_INTERNED_KEY(video, ATTR_QUOTED_STRING),
+    ATTR_INTERNED_KEY(video_range, ATTR_QUOTED_STRING),
+    ATTR_INTERNED_KEY(subtitles, ATTR_QUOTED_STRING),
+    ATTR_KEY(pathway_id, ATTR_QUOTED_STRING),
+    ATTR_KEY(stable_variant_id, ATTR_QUOTED_STRING),
+    ATTR_KEY(program_id, ATTR_INT),
+    ATTR_KEY(bandwidth, ATTR_BANDWIDTH),
+    ATTR_KEY(average_bandwidth, ATTR_INT),
+    ATTR_KEY(frame_rate, ATTR_FLOAT),
+    ATTR_INTERNED_KEY(hdcp_level, ATTR_STRING),
 };
 #define NUM_STREAM_INF_PARSERS (sizeof(stream_inf_parsers) / sizeof(stream_inf_parsers[0]))
 
 /* Media attribute parsers */
 static const AttrParser media_parsers[] = {
-    {"uri", ATTR_QUOTED_STRING},
-    {"group_id", ATTR_QUOTED_STRING},
-    {"language", ATTR_QUOTED_STRING},
-    {"assoc_language", ATTR_QUOTED_STRING},
-    {"name", ATTR_QUOTED_STRING},
-    {"instream_id", ATTR_QUOTED_STRING},
-    {"characteristics", ATTR_QUOTED_STRING},
-    {"channels", ATTR_QUOTED_STRING},
-    {"stable_rendition_id", ATTR_QUOTED_STRING},
-    {"thumbnails", ATTR_QUOTED_STRING},
-    {"image", ATTR_QUOTED_STRING},
+    ATTR_INTERNED_KEY(type, ATTR_STRING),
+    ATTR_KEY(uri, ATTR_QUOTED_STRING),
+    ATTR_INTERNED_KEY(group_id, ATTR_QUOTED_STRING),
+    ATTR_INTERNED_KEY(language, ATTR_QUOTED_STRING),
+    ATTR_INTERNED_KEY(assoc_language, ATTR_QUOTED_STRING),
+    ATTR_KEY(name, ATTR_QUOTED_STRING),
+    ATTR_KEY(instream_id, ATTR_QUOTED_STRING),
+    ATTR_INTERNED_KEY(characteristics, ATTR_QUOTED_STRING),
+    ATTR_INTERNED_KEY(channels, ATTR_QUOTED_STRING),
+    ATTR_KEY(stable_rendition_id, ATTR_QUOTED_STRING),
+    ATTR_KEY(thumbnails, ATTR_QUOTED_STRING),
+    ATTR_KEY(image, ATTR_QUOTED_STRING),
+    ATTR_INTERNED_KEY(default, ATTR_STRING),
+    ATTR_INTERNED_KEY(autoselect, ATTR_STRING),
+    ATTR_INTERNED_KEY(forced, ATTR_STRING),
 };
 #define NUM_MEDIA_PARSERS (sizeof(media_parsers) / sizeof(media_parsers[0]))
 
 /* Part attribute parsers */
 static const AttrParser part_parsers[] = {
-    {"uri", ATTR_QUOTED_STRING},
-    {"duration", ATTR_FLOAT},
-    {"independent", ATTR_STRING},
-    {"gap", ATTR_STRING},
-    {"byterange", ATTR_STRING},
+    ATTR_KEY(uri, ATTR_QUOTED_STRING),
+    ATTR_KEY(duration, ATTR_FLOAT),
+    ATTR_INTERNED_KEY(independent, ATTR_STRING),
+    ATTR_INTERNED_KEY(gap, ATTR_STRING),
+    ATTR_KEY(byterange, ATTR_STRING),
 };
 #define NUM_PART_PARSERS (sizeof(part_parsers) / sizeof(part_parsers[0]))
 
 /* Rendition report parsers */
 static const AttrParser rendition_report_parsers[] = {
-    {"uri", ATTR_QUOTED_STRING},
-    {"last_msn", ATTR_INT},
-    {"last_part", ATTR_INT},
+    ATTR_KEY(uri, ATTR_QUOTED_STRING),
+    ATTR_KEY(last_msn, ATTR_INT),
+    ATTR_KEY(last_part, ATTR_INT),
 };
 #define NUM_RENDITION_REPORT_PARSERS (sizeof(rendition_report_parsers) / sizeof(rendition_report_parsers[0]))
 
 /* Skip parsers */
 static const AttrParser skip_parsers[] = {
-    {"recently_removed_dateranges", ATTR_QUOTED_STRING},
-    {"skipped_segments", ATTR_INT},
+    ATTR_KEY(recently_removed_dateranges, ATTR_QUOTED_STRING),
+    ATTR_KEY(skipped_segments, ATTR_INT),
 };
 #define NUM_SKIP_PARSERS (sizeof(skip_parsers) / sizeof(skip_parsers[0]))
 
 /* Server control parsers */
 static const AttrParser server_control_parsers[] = {
-    {"can_block_reload", ATTR_STRING},
-    {"hold_back", ATTR_FLOAT},
-    {"part_hold_back", ATTR_FLOAT},
-    {"can_skip_until", ATTR_FLOAT},
-    {"can_skip_dateranges", ATTR_STRING},
+    ATTR_KEY(can_block_reload, ATTR_STRING),
+    ATTR_KEY(hold_back, ATTR_FLOAT),
+    ATTR_KEY(part_hold_back, ATTR_FLOAT),
+    ATTR_KEY(can_skip_until, ATTR_FLOAT),
+    ATTR_KEY(can_skip_dateranges, ATTR_STRING),
 };
 #define NUM_SERVER_CONTROL_PARSERS (sizeof(server_control_parsers) / sizeof(server_control_parsers[0]))
 
 /* Part inf parsers */
 static const AttrParser part_inf_parsers[] = {
-    {"part_target", ATTR_FLOAT},
+    ATTR_KEY(part_target, ATTR_FLOAT),
 };
 #define NUM_PART_INF_PARSERS (sizeof(part_inf_parsers) / sizeof(part_inf_parsers[0]))
 
 /* Preload hint parsers */
 static const AttrParser preload_hint_parsers[] = {
-    {"uri", ATTR_QUOTED_STRING},
-    {"type", ATTR_STRING},
-    {"byterange_start", ATTR_INT},
-    {"byterange_length", ATTR_INT},
+    ATTR_KEY(uri, ATTR_QUOTED_STRING),
+    ATTR_INTERNED_KEY(type, ATTR_STRING),
+    ATTR_KEY(byterange_start, ATTR_INT),
+    ATTR_KEY(byterange_length, ATTR_INT),
 };
 #define NUM_PRELOAD_HINT_PARSERS (sizeof(preload_hint_parsers) / sizeof(preload_hint_parsers[0]))
 
 /* Daterange parsers */
 static const AttrParser daterange_parsers[] = {
-    {"id", ATTR_QUOTED_STRING},
-    {"class", ATTR_QUOTED_STRING},
-    {"start_date", ATTR_QUOTED_STRING},
-    {"end_date", ATTR_QUOTED_STRING},
-    {"duration", ATTR_FLOAT},
-    {"planned_duration", ATTR_FLOAT},
-    {"end_on_next", ATTR_STRING},
-    {"scte35_cmd", ATTR_STRING},
-    {"scte35_out", ATTR_STRING},
-    {"scte35_in", ATTR_STRING},
+    ATTR_KEY(id, ATTR_QUOTED_STRING),
+    ATTR_INTERNED_KEY(class, ATTR_QUOTED_STRING),
+    ATTR_KEY(start_date, ATTR_QUOTED_STRING),
+    ATTR_KEY(end_date, ATTR_QUOTED_STRING),
+    ATTR_KEY(duration, ATTR_FLOAT),
+    ATTR_KEY(planned_duration, ATTR_FLOAT),
+    ATTR_INTERNED_KEY(end_on_next, ATTR_STRING),
+    ATTR_KEY(scte35_cmd, ATTR_STRING),
+    ATTR_KEY(scte35_out, ATTR_STRING),
+    ATTR_KEY(scte35_in, ATTR_STRING),
 };
 #define NUM_DATERANGE_PARSERS (sizeof(daterange_parsers) / sizeof(daterange_parsers[0]))
 
 /* Session data parsers */
 static const AttrParser session_data_parsers[] = {
-    {"data_id", ATTR_QUOTED_STRING},
-    {"value", ATTR_QUOTED_STRING},
-    {"uri", ATTR_QUOTED_STRING},
-    {"language", ATTR_QUOTED_STRING},
+    ATTR_KEY(data_id, ATTR_QUOTED_STRING),
+    ATTR_KEY(value, ATTR_QUOTED_STRING),
+    ATTR_KEY(uri, ATTR_QUOTED_STRING),
+    ATTR_KEY(language, ATTR_QUOTED_STRING),
 };
 #define NUM_SESSION_DATA_PARSERS (sizeof(session_data_parsers) / sizeof(session_data_parsers[0]))
 
 /* Content steering parsers */
 static const AttrParser content_steering_parsers[] = {
-    {"server_uri", ATTR_QUOTED_STRING},
-    {"pathway_id", ATTR_QUOTED_STRING},
+    ATTR_KEY(server_uri, ATTR_QUOTED_STRING),
+    ATTR_KEY(pathway_id, ATTR_QUOTED_STRING),
 };
 #define NUM_CONTENT_STEERING_PARSERS (sizeof(content_steering_parsers) / sizeof(content_steering_parsers[0]))
 
 /* X-MAP parsers */
 static const AttrParser x_map_parsers[] = {
-    {"uri", ATTR_QUOTED_STRING},
-    {"byterange", ATTR_QUOTED_STRING},
+    ATTR_KEY(uri, ATTR_QUOTED_STRING),
+    ATTR_KEY(byterange, ATTR_QUOTED_STRING),
 };
 #define NUM_X_MAP_PARSERS (sizeof(x_map_parsers) / sizeof(x_map_parsers[0]))
 
 /* Start parsers */
 static const AttrParser start_parsers[] = {
-    {"time_offset", ATTR_FLOAT},
+    ATTR_KEY(time_offset, ATTR_FLOAT),
 };
 #define NUM_START_PARSERS (sizeof(start_parsers) / sizeof(start_parsers[0]))
 
 /* Tiles parsers */
 static const AttrParser tiles_parsers[] = {
-    {"uri", ATTR_QUOTED_STRING},
-    {"resolution", ATTR_STRING},
-    {"layout", ATTR_STRING},
-    {"duration", ATTR_FLOAT},
+    ATTR_KEY(uri, ATTR_QUOTED_STRING),
+    ATTR_KEY(resolution, ATTR_STRING),
+    ATTR_KEY(layout, ATTR_STRING),
+    ATTR_KEY(duration, ATTR_FLOAT),
 };
 #define NUM_TILES_PARSERS (sizeof(tiles_parsers) / sizeof(tiles_parsers[0]))
 
-/* Image stream inf parsers */
-static const AttrParser image_stream_inf_parsers[] = {
-    {"codecs", ATTR_QUOTED_STRING},
-    {"uri", ATTR_QUOTED_STRING},
-    {"pathway_id", ATTR_QUOTED_STRING},
-    {"stable_variant_id", ATTR_QUOTED_STRING},
-    {"program_id", ATTR_INT},
-    {"bandwidth", ATTR_INT},
-    {"average_bandwidth", ATTR_INT},
-    {"resolution", ATTR_STRING},
-};
-#define NUM_IMAGE_STREAM_INF_PARSERS (sizeof(image_stream_inf_parsers) / sizeof(image_stream_inf_parsers[0]))
-
-/* IFrame stream inf parsers */
-static const AttrParser iframe_stream_inf_parsers[] = {
-    {"codecs", ATTR_QUOTED_STRING},
-    {"uri", ATTR_QUOTED_STRING},
-    {"pathway_id", ATTR_QUOTED_STRING},
-    {"stable_variant_id", ATTR_QUOTED_STRING},
-    {"program_id", ATTR_INT},
-    {"bandwidth", ATTR_INT},
-    {"average_bandwidth", ATTR_INT},
-    {"hdcp_level", ATTR_STRING},
+/*
+ * I-frame and image stream inf parsers. Both tags carry the same typed
+ * attributes; HDCP-LEVEL and RESOLUTION are plain strings either way.
+ */
+static const AttrParser uri_stream_inf_parsers[] = {
+    ATTR_INTERNED_KEY(codecs, ATTR_QUOTED_STRING),
+    ATTR_KEY(uri, ATTR_QUOTED_STRING),
+    ATTR_KEY(pathway_id, ATTR_QUOTED_STRING),
+    ATTR_KEY(stable_variant_id, ATTR_QUOTED_STRING),
+    ATTR_KEY(program_id, ATTR_INT),
+    ATTR_KEY(bandwidth, ATTR_INT),
+    ATTR_KEY(average_bandwidth, ATTR_INT),
+    ATTR_INTERNED_KEY(hdcp_level, ATTR_STRING),
+    ATTR_KEY(resolution, ATTR_STRING),
 };
-#define NUM_IFRAME_STREAM_INF_PARSERS (sizeof(iframe_stream_inf_parsers) / sizeof(iframe_stream_inf_parsers[0]))
+#define NUM_URI_STREAM_INF_PARSERS (sizeof(uri_stream_inf_parsers) / sizeof(uri_stream_inf_parsers[0]))
 
 /* Cueout cont parsers */
 static const AttrParser cueout_cont_parsers[] = {
-    {"duration", ATTR_QUOTED_STRING},
-    {"elapsedtime", ATTR_QUOTED_STRING},
-    {"scte35", ATTR_QUOTED_STRING},
+    ATTR_KEY(duration, ATTR_QUOTED_STRING),
+    ATTR_KEY(elapsedtime, ATTR_QUOTED_STRING),
+    ATTR_KEY(scte35, ATTR_QUOTED_STRING),
 };
 #define NUM_CUEOUT_CONT_PARSERS (sizeof(cueout_cont_parsers) / sizeof(cueout_cont_parsers[0]))
 
 /* Cueout parsers */
 static const AttrParser cueout_parsers[] = {
-    {"cue", ATTR_QUOTED_STRING},
+    ATTR_KEY(cue, ATTR_QUOTED_STRING),
 };
 #define NUM_CUEOUT_PARSERS (sizeof(cueout_parsers) / sizeof(cueout_parsers[0]))
 
 
-/*
- * Helper: parse attribute list with quote removal.
- * Returns new dict with unquoted values, or NULL on error.
- */
-static PyObject *
-parse_attrs_unquoted(const char *line, const char *tag)
-{
-    PyObject *raw_attrs = parse_attribute_list(line, tag);
-    if (!raw_attrs) return NULL;
-
-    PyObject *result = PyDict_New();
-    if (!result) { Py_DECREF(raw_attrs); return NULL; }
-
-    PyObject *k, *v;
-    Py_ssize_t pos = 0;
-    while (PyDict_Next(raw_attrs, &pos, &k, &v)) {
-        PyObject *unquoted = remove_quotes_py(v);
-        if (unquoted == NULL || PyDict_SetItem(result, k, unquoted) < 0) {
-            Py_XDECREF(unquoted);
-            Py_DECREF(result);
-            Py_DECREF(raw_attrs);
-            return NULL;
-        }
-        Py_DECREF(unquoted);
-    }
-    Py_DECREF(raw_attrs);
-    return result;
-}
-
 /* Parse a key tag */
 static int
 parse_key(m3u8_state *mod_state, const char *line, PyObject *data, PyObject *state)
 {
-    PyObject *key = parse_attrs_unquoted(line, EXT_X_KEY);
+    PyObject *key = parse_prefixed_attribute_list(mod_state, line, EXT_X_KEY,
+                                                  key_parsers, NUM_KEY_PARSERS, 1);
     if (!key) return -1;
 
     /* Set current key in state */
@@ -1522,28 +1761,31 @@ parse_key(m3u8_state *mod_state, const char *line, PyObject *data, PyObject *sta
  * Returns 0 on success, -1 on failure with exception set.
  */
 static int
-parse_extinf(m3u8_state *mod_state, const char *line, PyObject *state,
-             int lineno, int strict)
+parse_extinf(m3u8_state *mod_state, const char *line, Py_ssize_t line_len,
+             PyObject *state, int lineno, int strict)
 {
     const char *content = line + strlen(EXTINF) + 1;  /* Skip "#EXTINF:" */
+    const char *end = line + line_len;
 
     /* Find comma separator */
-    const char *comma = strchr(content, ',');
+    const char *comma = memchr(content, ',', (size_t)(end - content));
     double duration;
-    const char *title = "";
+    const char *title = end;
 
     if (comma != NULL) {
-        char duration_str[64];
         size_t dur_len = comma - content;
-        if (dur_len >= sizeof(duration_str)) {
-            dur_len = sizeof(duration_str) - 1;
-        }
-        memcpy(duration_str, content, dur_len);
-        duration_str[dur_len] = '\0';
-        duration = PyOS_string_to_double(duration_str, NULL, NULL);
-        if (duration == -1.0 && PyErr_Occurred()) {
-            PyErr_Clear();
-            duration = 0.0;
+        if (!parse_decimal_fast(content, (Py_ssize_t)dur_len, &duration)) {
+            char duration_str[64];
+            if (dur_len >= sizeof(duration_str)) {
+                dur_len = sizeof(duration_str) - 1;
+            }
+            memcpy(duration_str, content, dur_len);
+            duration_str[dur_len] = '\0';
+            duration = PyOS_string_to_double(duration_str, NULL, NULL);
+            if (duration == -1.0 && PyErr_Occurred()) {
+                PyErr_Clear();
+                duration = 0.0;
+            }
         }
         title = comma + 1;
     } else {
@@ -1551,10 +1793,12 @@ parse_extinf(m3u8_state *mod_state, const char *line, PyObject *state,
             raise_parse_error(mod_state, lineno, line);
             return -1;
         }
-        duration = PyOS_string_to_double(content, NULL, NULL);
-        if (duration == -1.0 && PyErr_Occurred()) {
-            PyErr_Clear();
-            duration = 0.0;
+        if (!parse_decimal_fast(content, (Py_ssize_t)(end - content), &duration)) {
+            duration = PyOS_string_to_double(content, NULL, NULL);
+            if (duration == -1.0 && PyErr_Occurred()) {
+                PyErr_Clear();
+                duration = 0.0;
+            }
         }
     }
 
@@ -1576,7 +1820,7 @@ parse_extinf(m3u8_state *mod_state, const char *line, PyObject *state,
     Py_DECREF(py_duration);
 
     /* Set title using interned key */
-    PyObject *py_title = PyUnicode_FromString(title);
+    PyObject *py_title = PyUnicode_FromStringAndSize(title, end - title);
     if (py_title == NULL) {
         return -1;
     }
@@ -1595,13 +1839,27 @@ parse_extinf(m3u8_state *mod_state, const char *line, PyObject *state,
 
 /*
  * Parse a segment URI line.
+ *
+ * ctx->keys_has_none caches whether None is already in data["keys"], so
+ * the list is scanned at most once between custom_tags_parser calls
+ * instead of once per unencrypted segment. The segment flags collected
+ * since the previous segment are consumed here.
+ *
  * Returns 0 on success, -1 on failure with exception set.
  */
 static int
-parse_ts_chunk(m3u8_state *mod_state, const char *line,
-               PyObject *data, PyObject *state)
+parse_ts_chunk(ParseContext *ctx, const char *line, Py_ssize_t line_len)
 {
-    /* Get segment dict from state using interned key, or create new one */
+    m3u8_state *mod_state = ctx->mod_state;
+    PyObject *data = ctx->data;
+    PyObject *state = ctx->state;
+    const unsigned int flags = ctx->segment_flags;
+
+    /*
+     * Take the segment dict out of state, or create a new one. Keys that
+     * are usually absent are only deleted when present, so the common
+     * path never raises and clears a KeyError.
+     */
     PyObject *segment = dict_get_interned(state, mod_state->str_segment);
     if (segment == NULL) {
         segment = PyDict_New();
@@ -1610,18 +1868,14 @@ parse_ts_chunk(m3u8_state *mod_state, const char *line,
         }
     } else {
         Py_INCREF(segment);
-    }
-    /* Remove segment from state (we're taking ownership) */
-    if (PyDict_DelItem(state, mod_state->str_segment) < 0) {
-        if (!PyErr_ExceptionMatches(PyExc_KeyError)) {
+        if (PyDict_DelItem(state, mod_state->str_segment) < 0) {
             Py_DECREF(segment);
             return -1;
         }
-        PyErr_Clear();
     }
 
     /* Add URI using interned key */
-    PyObject *uri = PyUnicode_FromString(line);
+    PyObject *uri = PyUnicode_FromStringAndSize(line, line_len);
     if (uri == NULL) {
         Py_DECREF(segment);
         return -1;
@@ -1674,8 +1928,9 @@ parse_ts_chunk(m3u8_state *mod_state, const char *line,
         }
     }
 
-    /* Boolean flags from state - use transfer_state_bool helper */
-    if (transfer_state_bool(state, segment, mod_state->str_cue_in) < 0) {
+    /* Boolean flags collected since the previous segment */
+    if (set_segment_flag(segment, mod_state->str_cue_in, flags,
+                         SEG_FLAG_CUE_IN, Py_False) < 0) {
         Py_DECREF(segment);
         return -1;
     }
@@ -1692,8 +1947,10 @@ parse_ts_chunk(m3u8_state *mod_state, const char *line,
         return -1;
     }
 
-    if (transfer_state_bool(state, segment, mod_state->str_cue_out_start) < 0 ||
-        transfer_state_bool(state, segment, mod_state->str_cue_out_explicitly_duration) < 0) {
+    if (set_segment_flag(segment, mod_state->str_cue_out_start, flags,
+                         SEG_FLAG_CUE_OUT_START, Py_False) < 0 ||
+        set_segment_flag(segment, mod_state->str_cue_out_explicitly_duration, flags,
+                         SEG_FLAG_CUE_OUT_EXPLICITLY_DURATION, Py_False) < 0) {
         Py_DECREF(segment);
         return -1;
     }
@@ -1737,13 +1994,14 @@ parse_ts_chunk(m3u8_state *mod_state, const char *line,
         }
     }
 
-    if (del_item_interned_ignore_keyerror(state, mod_state->str_cue_out) < 0) {
+    if (cue_out && del_item_interned_ignore_keyerror(state, mod_state->str_cue_out) < 0) {
         Py_DECREF(segment);
         return -1;
     }
 
     /* Discontinuity */
-    if (transfer_state_bool(state, segment, mod_state->str_discontinuity) < 0) {
+    if (set_segment_flag(segment, mod_state->str_discontinuity, flags,
+                         SEG_FLAG_DISCONTINUITY, Py_False) < 0) {
         Py_DECREF(segment);
         return -1;
     }
@@ -1755,7 +2013,7 @@ parse_ts_chunk(m3u8_state *mod_state, const char *line,
             Py_DECREF(segment);
             return -1;
         }
-    } else {
+    } else if (!ctx->keys_has_none) {
         /* For unencrypted segments, ensure None is in keys list */
         PyObject *keys = dict_get_interned(data, mod_state->str_keys);
         if (keys) {
@@ -1782,6 +2040,7 @@ parse_ts_chunk(m3u8_state *mod_state, const char *line,
                     return -1;
                 }
             }
+            ctx->keys_has_none = 1;
         }
     }
 
@@ -1802,16 +2061,13 @@ parse_ts_chunk(m3u8_state *mod_state, const char *line,
         return -1;
     }
 
-    /* Gap - special: read str_gap, write to str_gap_tag as True/None */
-    PyObject *gap = dict_get_interned(state, mod_state->str_gap);
-    if (dict_set_interned(segment, mod_state->str_gap_tag, gap ? Py_True : Py_None) < 0) {
-        Py_DECREF(segment);
-        return -1;
-    }
-    if (gap && del_item_interned_ignore_keyerror(state, mod_state->str_gap) < 0) {
+    /* Gap - special: written to str_gap_tag as True/None */
+    if (set_segment_flag(segment, mod_state->str_gap_tag, flags,
+                         SEG_FLAG_GAP, Py_None) < 0) {
         Py_DECREF(segment);
         return -1;
     }
+    ctx->segment_flags = 0;
 
     /* Add to segments list using interned key */
     PyObject *segments = dict_get_interned(data, mod_state->str_segments);
@@ -1832,7 +2088,7 @@ parse_ts_chunk(m3u8_state *mod_state, const char *line,
 }
 
 /* Parse variant playlist - uses interned strings throughout */
-static int parse_variant_playlist(m3u8_state *ms, const char *line,
+static int parse_variant_playlist(m3u8_state *ms, const char *line, Py_ssize_t line_len,
                                   PyObject *data, PyObject *state) {
     PyObject *stream_info = dict_get_interned(state, ms->str_stream_info);
     if (!stream_info) {
@@ -1840,10 +2096,10 @@ static int parse_variant_playlist(m3u8_state *ms, const char *line,
         if (!stream_info) return -1;
     } else {
         Py_INCREF(stream_info);
-    }
-    if (del_item_interned_ignore_keyerror(state, ms->str_stream_info) < 0) {
-        Py_DECREF(stream_info);
-        return -1;
+        if (PyDict_DelItem(state, ms->str_stream_info) < 0) {
+            Py_DECREF(stream_info);
+            return -1;
+        }
     }
 
     PyObject *playlist = PyDict_New();
@@ -1852,7 +2108,7 @@ static int parse_variant_playlist(m3u8_state *ms, const char *line,
         return -1;
     }
 
-    PyObject *uri = PyUnicode_FromString(line);
+    PyObject *uri = PyUnicode_FromStringAndSize(line, line_len);
     if (!uri) {
         Py_DECREF(playlist);
         Py_DECREF(stream_info);
@@ -1921,9 +2177,10 @@ parse_program_date_time(m3u8_state *ms, const char *line,
  * Returns 0 on success, -1 on failure with exception set.
  */
 static int
-parse_part(m3u8_state *ms, const char *line, PyObject *state)
+parse_part(m3u8_state *ms, const char *line, PyObject *state,
+           unsigned int *segment_flags)
 {
-    PyObject *part = parse_typed_attribute_list(line, EXT_X_PART,
+    PyObject *part = parse_typed_attribute_list(ms, line, EXT_X_PART,
                                                  part_parsers, NUM_PART_PARSERS);
     if (part == NULL) return -1;
 
@@ -1962,35 +2219,22 @@ parse_part(m3u8_state *ms, const char *line, PyObject *state)
         return -1;
     }
 
-    /* Add gap_tag - read from str_gap, write True/None to str_gap_tag */
-    PyObject *gap = dict_get_interned(state, ms->str_gap);
-    if (dict_set_interned(part, ms->str_gap_tag, gap ? Py_True : Py_None) < 0) {
-        Py_DECREF(part);
-        return -1;
-    }
-    if (gap && del_item_interned_ignore_keyerror(state, ms->str_gap) < 0) {
+    /* Add gap_tag - True/None from the pending EXT-X-GAP flag */
+    if (set_segment_flag(part, ms->str_gap_tag, *segment_flags,
+                         SEG_FLAG_GAP, Py_None) < 0) {
         Py_DECREF(part);
         return -1;
     }
+    *segment_flags &= ~SEG_FLAG_GAP;
 
     /* Get or create segment */
-    PyObject *segment = dict_get_interned(state, ms->str_segment);
+    PyObject *segment = get_or_create_segment(ms, state);
     if (segment == NULL) {
-        segment = PyDict_New();
-        if (segment == NULL) {
-            Py_DECREF(part);
-            return -1;
-        }
-        if (dict_set_interned(state, ms->str_segment, segment) < 0) {
-            Py_DECREF(segment);
-            Py_DECREF(part);
-            return -1;
-        }
-        Py_DECREF(segment);
-        segment = dict_get_interned(state, ms->str_segment);
+        Py_DECREF(part);
+        return -1;
     }
 
-    /* Get or create parts list in segment */
+    /* Get or create parts list in segment (borrowed from segment once set) */
     PyObject *parts = dict_get_interned(segment, ms->str_parts);
     if (parts == NULL) {
         parts = PyList_New(0);
@@ -1998,13 +2242,12 @@ parse_part(m3u8_state *ms, const char *line, PyObject *state)
             Py_DECREF(part);
             return -1;
         }
-        if (dict_set_interned(segment, ms->str_parts, parts) < 0) {
-            Py_DECREF(parts);
+        int rc = dict_set_interned(segment, ms->str_parts, parts);
+        Py_DECREF(parts);
+        if (rc < 0) {
             Py_DECREF(part);
             return -1;
         }
-        Py_DECREF(parts);
-        parts = dict_get_interned(segment, ms->str_parts);
     }
 
     if (PyList_Append(parts, part) < 0) {
@@ -2016,9 +2259,10 @@ parse_part(m3u8_state *ms, const char *line, PyObject *state)
 }
 
 /* Parse cue out - uses interned strings for state dict */
-static int parse_cueout(m3u8_state *ms, const char *line, PyObject *state) {
-    if (dict_set_interned(state, ms->str_cue_out_start, Py_True) < 0 ||
-        dict_set_interned(state, ms->str_cue_out, Py_True) < 0) {
+static int parse_cueout(m3u8_state *ms, const char *line, PyObject *state,
+                        unsigned int *segment_flags) {
+    *segment_flags |= SEG_FLAG_CUE_OUT_START;
+    if (dict_set_interned(state, ms->str_cue_out, Py_True) < 0) {
         return -1;
     }
 
@@ -2031,9 +2275,7 @@ static int parse_cueout(m3u8_state *ms, const char *line, PyObject *state) {
     upper_line[i] = '\0';
 
     if (strstr(upper_line, "DURATION")) {
-        if (dict_set_interned(state, ms->str_cue_out_explicitly_duration, Py_True) < 0) {
-            return -1;
-        }
+        *segment_flags |= SEG_FLAG_CUE_OUT_EXPLICITLY_DURATION;
     }
 
     /* Parse attributes if present */
@@ -2042,13 +2284,13 @@ static int parse_cueout(m3u8_state *ms, const char *line, PyObject *state) {
         return 0;
     }
 
-    PyObject *cue_info = parse_typed_attribute_list(line, EXT_X_CUE_OUT,
+    PyObject *cue_info = parse_typed_attribute_list(ms, line, EXT_X_CUE_OUT,
         cueout_parsers, NUM_CUEOUT_PARSERS);
     if (!cue_info) return -1;
 
-    /* cue_info uses attr keys like "cue", "duration", "" - not interned */
-    PyObject *cue_out_scte35 = PyDict_GetItemString(cue_info, "cue");
-    PyObject *cue_out_duration = PyDict_GetItemString(cue_info, "duration");
+    /* Schema keys in cue_info are interned; the keyless "" one is not */
+    PyObject *cue_out_scte35 = dict_get_interned(cue_info, ms->str_cue);
+    PyObject *cue_out_duration = dict_get_interned(cue_info, ms->str_duration);
     if (!cue_out_duration) {
         cue_out_duration = PyDict_GetItemString(cue_info, "");
     }
@@ -2078,11 +2320,11 @@ static int parse_cueout_cont(m3u8_state *ms, const char *line, PyObject *state)
     const char *colon = strchr(line, ':');
     if (!colon || *(colon + 1) == '\0') return 0;
 
-    PyObject *cue_info = parse_typed_attribute_list(line, EXT_X_CUE_OUT_CONT,
+    PyObject *cue_info = parse_typed_attribute_list(ms, line, EXT_X_CUE_OUT_CONT,
         cueout_cont_parsers, NUM_CUEOUT_CONT_PARSERS);
     if (!cue_info) return -1;
 
-    /* cue_info uses attr keys like "", "duration", etc. - not interned */
+    /* Schema keys in cue_info are interned; the keyless "" one is not */
     PyObject *progress = PyDict_GetItemString(cue_info, "");
     if (progress) {
         if (!PyUnicode_Check(progress)) {
@@ -2118,19 +2360,19 @@ static int parse_cueout_cont(m3u8_state *ms, const char *line, PyObject *state)
         }
     }
 
-    PyObject *duration = PyDict_GetItemString(cue_info, "duration");
+    PyObject *duration = dict_get_interned(cue_info, ms->str_duration);
     if (duration && dict_set_interned(state, ms->str_current_cue_out_duration, duration) < 0) {
         Py_DECREF(cue_info);
         return -1;
     }
 
-    PyObject *scte35 = PyDict_GetItemString(cue_info, "scte35");
+    PyObject *scte35 = dict_get_interned(cue_info, ms->str_scte35);
     if (scte35 && dict_set_interned(state, ms->str_current_cue_out_scte35, scte35) < 0) {
         Py_DECREF(cue_info);
         return -1;
     }
 
-    PyObject *elapsedtime = PyDict_GetItemString(cue_info, "elapsedtime");
+    PyObject *elapsedtime = dict_get_interned(cue_info, ms->str_elapsedtime);
     if (elapsedtime && dict_set_interned(state, ms->str_current_cue_out_elapsedtime, elapsedtime) < 0) {
         Py_DECREF(cue_info);
         return -1;
@@ -2157,7 +2399,7 @@ static int parse_cueout_cont(m3u8_state *ms, const char *line, PyObject *state)
 #define MAKE_INT_HANDLER(name, tag, field) \
     static int name(ParseContext *ctx, const char *line) { \
         const char *value = line + sizeof(tag); \
-        PyObject *py_value = PyLong_FromString(value, NULL, 10); \
+        PyObject *py_value = long_from_cstr(value); \
         if (py_value == NULL) { PyErr_Clear(); return 0; } \
         int rc = dict_set_interned(ctx->data, ctx->mod_state->field, py_value); \
         Py_DECREF(py_value); \
@@ -2185,7 +2427,8 @@ MAKE_PARSE_WRAPPER(handle_key, parse_key)
 static int
 handle_extinf(ParseContext *ctx, const char *line)
 {
-    int rc = parse_extinf(ctx->mod_state, line, ctx->state, ctx->lineno, ctx->strict);
+    int rc = parse_extinf(ctx->mod_state, line, ctx->line_len, ctx->state,
+                          ctx->lineno, ctx->strict);
     if (rc == 0) {
         ctx->expect_segment = 1;
     }
@@ -2223,7 +2466,7 @@ handle_bitrate(ParseContext *ctx, const char *line)
     if (segment == NULL) {
         return -1;
     }
-    PyObject *py_value = PyLong_FromString(value, NULL, 10);
+    PyObject *py_value = long_from_cstr(value);
     if (py_value == NULL) {
         PyErr_Clear();
         return 0;
@@ -2243,7 +2486,7 @@ handle_stream_inf(ParseContext *ctx, const char *line)
     if (dict_set_interned(ctx->data, ms->str_is_variant, Py_True) < 0) return -1;
     if (dict_set_interned(ctx->data, ms->str_media_sequence, Py_None) < 0) return -1;
 
-    PyObject *stream_info = parse_typed_attribute_list(line, EXT_X_STREAM_INF,
+    PyObject *stream_info = parse_typed_attribute_list(ctx->mod_state, line, EXT_X_STREAM_INF,
         stream_inf_parsers, NUM_STREAM_INF_PARSERS);
     if (stream_info == NULL) return -1;
     int rc = dict_set_interned(ctx->state, ms->str_stream_info, stream_info);
@@ -2261,7 +2504,7 @@ handle_stream_inf_with_uri(ParseContext *ctx, const char *line, const char *tag,
                            const char *info_key, PyObject *list_key)
 {
     m3u8_state *ms = ctx->mod_state;
-    PyObject *info = parse_typed_attribute_list(line, tag, parsers, num_parsers);
+    PyObject *info = parse_typed_attribute_list(ms, line, tag, parsers, num_parsers);
     if (info == NULL) return -1;
 
     /* Use interned string for URI lookup */
@@ -2305,13 +2548,13 @@ handle_stream_inf_with_uri(ParseContext *ctx, const char *line, const char *tag,
 
 static int handle_i_frame_stream_inf(ParseContext *ctx, const char *line) {
     return handle_stream_inf_with_uri(ctx, line, EXT_X_I_FRAME_STREAM_INF,
-        iframe_stream_inf_parsers, NUM_IFRAME_STREAM_INF_PARSERS,
+        uri_stream_inf_parsers, NUM_URI_STREAM_INF_PARSERS,
         "iframe_stream_info", ctx->mod_state->str_iframe_playlists);
 }
 
 static int handle_image_stream_inf(ParseContext *ctx, const char *line) {
     return handle_stream_inf_with_uri(ctx, line, EXT_X_IMAGE_STREAM_INF,
-        image_stream_inf_parsers, NUM_IMAGE_STREAM_INF_PARSERS,
+        uri_stream_inf_parsers, NUM_URI_STREAM_INF_PARSERS,
         "image_stream_info", ctx->mod_state->str_image_playlists);
 }
 
@@ -2320,7 +2563,7 @@ static int handle_image_stream_inf(ParseContext *ctx, const char *line) {
  */
 #define MAKE_TYPED_ATTR_LIST_HANDLER(name, tag, parsers, num_parsers, field) \
     static int name(ParseContext *ctx, const char *line) { \
-        PyObject *result = parse_typed_attribute_list(line, tag, parsers, num_parsers); \
+        PyObject *result = parse_typed_attribute_list(ctx->mod_state, line, tag, parsers, num_parsers); \
         if (result == NULL) return -1; \
         PyObject *list = dict_get_interned(ctx->data, ctx->mod_state->field); \
         int rc = PyList_Append(list, result); \
@@ -2369,7 +2612,8 @@ handle_allow_cache(ParseContext *ctx, const char *line)
 
 /*
  * Macro-generated flag handlers.
- * These handlers just set a boolean flag in either data or state dict.
+ * These handlers just set a boolean flag in the data or state dict, or
+ * in ctx->segment_flags for the markers the next segment consumes.
  */
 #define MAKE_DATA_FLAG_HANDLER(name, field) \
     static int name(ParseContext *ctx, const char *line) { \
@@ -2383,21 +2627,29 @@ handle_allow_cache(ParseContext *ctx, const char *line)
         return dict_set_interned(ctx->state, ctx->mod_state->field, Py_True); \
     }
 
+#define MAKE_SEGMENT_FLAG_HANDLER(name, flag) \
+    static int name(ParseContext *ctx, const char *line) { \
+        (void)line; \
+        ctx->segment_flags |= flag; \
+        return 0; \
+    }
+
 MAKE_DATA_FLAG_HANDLER(handle_i_frames_only, str_is_i_frames_only)
 MAKE_DATA_FLAG_HANDLER(handle_independent_segments, str_is_independent_segments)
 MAKE_DATA_FLAG_HANDLER(handle_endlist, str_is_endlist)
 MAKE_DATA_FLAG_HANDLER(handle_images_only, str_is_images_only)
-MAKE_STATE_FLAG_HANDLER(handle_discontinuity, str_discontinuity)
-MAKE_STATE_FLAG_HANDLER(handle_cue_in, str_cue_in)
+MAKE_SEGMENT_FLAG_HANDLER(handle_discontinuity, SEG_FLAG_DISCONTINUITY)
+MAKE_SEGMENT_FLAG_HANDLER(handle_cue_in, SEG_FLAG_CUE_IN)
 MAKE_STATE_FLAG_HANDLER(handle_cue_span, str_cue_out)
-MAKE_STATE_FLAG_HANDLER(handle_gap, str_gap)
+MAKE_SEGMENT_FLAG_HANDLER(handle_gap, SEG_FLAG_GAP)
 
 #undef MAKE_DATA_FLAG_HANDLER
 #undef MAKE_STATE_FLAG_HANDLER
+#undef MAKE_SEGMENT_FLAG_HANDLER
 
 /* Wrapper handlers for cue parsing */
 static int handle_cue_out(ParseContext *ctx, const char *line) {
-    return parse_cueout(ctx->mod_state, line, ctx->state);
+    return parse_cueout(ctx->mod_state, line, ctx->state, &ctx->segment_flags);
 }
 static int handle_cue_out_cont(ParseContext *ctx, const char *line) {
     return parse_cueout_cont(ctx->mod_state, line, ctx->state);
@@ -2434,7 +2686,7 @@ handle_oatcls_scte35(ParseContext *ctx, const char *line)
 static int
 handle_asset(ParseContext *ctx, const char *line)
 {
-    PyObject *asset = parse_attribute_list(line, EXT_X_ASSET);
+    PyObject *asset = parse_attribute_list(ctx->mod_state, line, EXT_X_ASSET, 0);
     if (asset == NULL) return -1;
     int rc = dict_set_interned(ctx->state, ctx->mod_state->str_asset_metadata, asset);
     Py_DECREF(asset);
@@ -2446,7 +2698,7 @@ static int
 handle_map(ParseContext *ctx, const char *line)
 {
     m3u8_state *ms = ctx->mod_state;
-    PyObject *map_info = parse_typed_attribute_list(line, EXT_X_MAP,
+    PyObject *map_info = parse_typed_attribute_list(ms, line, EXT_X_MAP,
         x_map_parsers, NUM_X_MAP_PARSERS);
     if (map_info == NULL) {
         return -1;
@@ -2467,7 +2719,7 @@ handle_map(ParseContext *ctx, const char *line)
  */
 #define MAKE_TYPED_ATTR_HANDLER(name, tag, parsers, num_parsers, field) \
     static int name(ParseContext *ctx, const char *line) { \
-        PyObject *result = parse_typed_attribute_list(line, tag, parsers, num_parsers); \
+        PyObject *result = parse_typed_attribute_list(ctx->mod_state, line, tag, parsers, num_parsers); \
         if (result == NULL) return -1; \
         int rc = dict_set_interned(ctx->data, ctx->mod_state->field, result); \
         Py_DECREF(result); \
@@ -2480,7 +2732,7 @@ MAKE_TYPED_ATTR_HANDLER(handle_part_inf, EXT_X_PART_INF, part_inf_parsers, NUM_P
 
 /* Handler for #EXT-X-PART */
 static int handle_part(ParseContext *ctx, const char *line) {
-    return parse_part(ctx->mod_state, line, ctx->state);
+    return parse_part(ctx->mod_state, line, ctx->state, &ctx->segment_flags);
 }
 
 MAKE_TYPED_ATTR_LIST_HANDLER(handle_rendition_report, EXT_X_RENDITION_REPORT, rendition_report_parsers, NUM_RENDITION_REPORT_PARSERS, str_rendition_reports)
@@ -2494,7 +2746,8 @@ MAKE_TYPED_ATTR_LIST_HANDLER(handle_tiles, EXT_X_TILES, tiles_parsers, NUM_TILES
 
 /* Handler for #EXT-X-SESSION-KEY */
 static int handle_session_key(ParseContext *ctx, const char *line) {
-    PyObject *key = parse_attrs_unquoted(line, EXT_X_SESSION_KEY);
+    PyObject *key = parse_prefixed_attribute_list(ctx->mod_state, line, EXT_X_SESSION_KEY,
+                                                  key_parsers, NUM_KEY_PARSERS, 1);
     if (!key) return -1;
     PyObject *session_keys = dict_get_interned(ctx->data, ctx->mod_state->str_session_keys);
     int rc = PyList_Append(session_keys, key);
@@ -2508,7 +2761,7 @@ MAKE_TYPED_ATTR_HANDLER(handle_preload_hint, EXT_X_PRELOAD_HINT, preload_hint_pa
 static int
 handle_daterange(ParseContext *ctx, const char *line)
 {
-    PyObject *daterange = parse_typed_attribute_list(line, EXT_X_DATERANGE,
+    PyObject *daterange = parse_typed_attribute_list(ctx->mod_state, line, EXT_X_DATERANGE,
         daterange_parsers, NUM_DATERANGE_PARSERS);
     if (daterange == NULL) {
         return -1;
@@ -2521,13 +2774,12 @@ handle_daterange(ParseContext *ctx, const char *line)
             Py_DECREF(daterange);
             return -1;
         }
-        if (dict_set_interned(ctx->state, ctx->mod_state->str_dateranges, dateranges) < 0) {
-            Py_DECREF(dateranges);
+        int rc = dict_set_interned(ctx->state, ctx->mod_state->str_dateranges, dateranges);
+        Py_DECREF(dateranges);  /* state now owns it; keep borrowed pointer */
+        if (rc < 0) {
             Py_DECREF(daterange);
             return -1;
         }
-        Py_DECREF(dateranges);
-        dateranges = dict_get_interned(ctx->state, ctx->mod_state->str_dateranges);
     }
 
     int rc = PyList_Append(dateranges, daterange);
@@ -2560,8 +2812,10 @@ handle_blackout(ParseContext *ctx, const char *line)
  * Tag dispatch table.
  *
  * This replaces the massive if/else strcmp chain with a data-driven approach.
- * Linear scan for ~40 tags is negligible compared to Python object creation.
- * The table is ordered roughly by frequency for marginally better cache behavior.
+ * dispatch_tag() does not scan the whole table: init_tag_index() groups the
+ * entries by tag_class_byte(), so a line is only compared against the few
+ * tags sharing its class byte. Within a class, table order is kept, so the
+ * table is still ordered roughly by frequency.
  *
  * Note: sizeof(TAG)-1 gives strlen at compile time (excluding null terminator).
  */
@@ -2623,6 +2877,56 @@ static const TagDispatch TAG_DISPATCH[] = {
 #undef VALUE_TAG
 #undef BARE_TAG
 
+#define NUM_TAG_DISPATCH (sizeof(TAG_DISPATCH) / sizeof(TAG_DISPATCH[0]) - 1)
+
+_Static_assert(NUM_TAG_DISPATCH <= MAX_TAG_DISPATCH,
+               "MAX_TAG_DISPATCH too small for TAG_DISPATCH");
+
+/*
+ * Class byte used to bucket tags for dispatch.
+ *
+ * Every tag in TAG_DISPATCH starts with "#EXT". For "#EXT-X-FOO" tags the
+ * class is the first byte after "#EXT-X-" ('F'); for the rest ("#EXTINF",
+ * "#EXT-OATCLS-SCTE35") it is the byte after "#EXT". Applied to a line,
+ * this yields the same byte as for any tag the line starts with, so only
+ * that class's handful of tags needs a full comparison. The string must be
+ * NUL-terminated and begin with "#EXT".
+ */
+static inline unsigned char
+tag_class_byte(const char *s)
+{
+    if (s[4] == '-' && s[5] == 'X' && s[6] == '-') {
+        return (unsigned char)s[7];
+    }
+    return (unsigned char)s[4];
+}
+
+/*
+ * Build the per-module tag dispatch index: a stable counting sort of the
+ * TAG_DISPATCH entries by tag_class_byte(). Stability keeps table order
+ * within each class.
+ */
+static void
+init_tag_index(m3u8_state *state)
+{
+    unsigned int counts[256] = {0};
+    for (size_t i = 0; i < NUM_TAG_DISPATCH; i++) {
+        counts[tag_class_byte(TAG_DISPATCH[i].tag)]++;
+    }
+    unsigned int offset = 0;
+    for (size_t c = 0; c < 256; c++) {
+        state->tag_index_start[c] = (unsigned char)offset;
+        offset += counts[c];
+    }
+    state->tag_index_start[256] = (unsigned char)offset;
+
+    unsigned char fill[256];
+    memcpy(fill, state->tag_index_start, sizeof(fill));
+    for (size_t i = 0; i < NUM_TAG_DISPATCH; i++) {
+        state->tag_index[fill[tag_class_byte(TAG_DISPATCH[i].tag)]++] = (unsigned char)i;
+    }
+}
+
 /*
  * Dispatch a tag to its handler using the dispatch table.
  *
@@ -2634,16 +2938,20 @@ static const TagDispatch TAG_DISPATCH[] = {
 static int
 dispatch_tag(ParseContext *ctx, const char *line, size_t line_len)
 {
-    /* Fast rejection: all M3U8 tags start with '#' */
-    if (line_len < 4 || line[0] != '#') {
+    /* Fast rejection: all M3U8 tags start with "#EXT" */
+    if (line_len < 5 || memcmp(line, "#EXT", 4) != 0) {
         return 0;
     }
 
-    for (const TagDispatch *d = TAG_DISPATCH; d->tag != NULL; d++) {
+    const m3u8_state *ms = ctx->mod_state;
+    unsigned char c = tag_class_byte(line);
+    for (unsigned int i = ms->tag_index_start[c]; i < ms->tag_index_start[c + 1]; i++) {
+        const TagDispatch *d = &TAG_DISPATCH[ms->tag_index[i]];
         /* Skip if line is shorter than tag */
         if (line_len < d->tag_len) continue;
 
-        if (strncmp(line, d->tag, d->tag_len) == 0) {
+        /* Every tag starts with "#EXT", which was checked above */
+        if (memcmp(line + 4, d->tag + 4, d->tag_len - 4) == 0) {
             /* Verify tag boundary and do not call value handlers on bare tags. */
             char next = line[d->tag_len];
             if (next == ':' || (next == '\0' && !d->requires_colon)) {
@@ -2714,28 +3022,27 @@ m3u8_parse(PyObject *module, PyObject *args, PyObject *kwargs)
 
     /* Check strict mode validation */
     if (strict) {
-        /* Import and call version_matching.validate */
-        PyObject *version_matching = PyImport_ImportModule("openm3u8.version_matching");
-        if (version_matching == NULL) {
-            return NULL;
-        }
-        PyObject *validate = PyObject_GetAttrString(version_matching, "validate");
-        if (validate == NULL) {
+        /* Look up version_matching.validate once; it is kept in module state */
+        if (mod_state->validate_func == NULL) {
+            PyObject *version_matching = PyImport_ImportModule("openm3u8.version_matching");
+            if (version_matching == NULL) {
+                return NULL;
+            }
+            mod_state->validate_func = PyObject_GetAttrString(version_matching, "validate");
             Py_DECREF(version_matching);
-            return NULL;
+            if (mod_state->validate_func == NULL) {
+                return NULL;
+            }
         }
         /* Build list like parser.py: content.strip().splitlines() */
         PyObject *lines_list = build_stripped_splitlines(trimmed);
         if (lines_list == NULL) {
-            Py_DECREF(validate);
-            Py_DECREF(version_matching);
             return NULL;
         }
 
-        PyObject *errors = PyObject_CallFunctionObjArgs(validate, lines_list, NULL);
+        PyObject *errors = PyObject_CallFunctionObjArgs(mod_state->validate_func,
+                                                        lines_list, NULL);
         Py_DECREF(lines_list);
-        Py_DECREF(validate);
-        Py_DECREF(version_matching);
 
         if (errors == NULL) {
             return NULL;
@@ -2754,6 +3061,11 @@ m3u8_parse(PyObject *module, PyObject *args, PyObject *kwargs)
         return NULL;
     }
 
+    /* Blank content: the result is just the default data dict */
+    if (trimmed_len == 0) {
+        return data;
+    }
+
     /* Initialize parser state dict */
     PyObject *state = init_parse_state(mod_state);
     if (state == NULL) {
@@ -2771,8 +3083,11 @@ m3u8_parse(PyObject *module, PyObject *args, PyObject *kwargs)
         .state = state,
         .strict = strict,
         .lineno = 0,
+        .line_len = 0,
         .expect_segment = 0,   /* Matches init_parse_state */
         .expect_playlist = 0,  /* Matches init_parse_state */
+        .keys_has_none = 0,
+        .segment_flags = 0,
     };
 
     /*
@@ -2783,24 +3098,27 @@ m3u8_parse(PyObject *module, PyObject *args, PyObject *kwargs)
     const char *p = trimmed;
     const char *end = trimmed + trimmed_len;
 
-    /* Reusable line buffer - starts small, grows as needed */
-    size_t line_buf_size = 256;
-    char *line_buf = PyMem_Malloc(line_buf_size);
-    if (line_buf == NULL) {
-        Py_DECREF(data);
-        Py_DECREF(state);
-        return PyErr_NoMemory();
-    }
+    /*
+     * Reusable line buffer. Lines shorter than LINE_BUF_STACK_SIZE (nearly
+     * all real-world lines) are copied into stack storage, so a typical
+     * parse performs no line buffer allocation at all. Longer lines move
+     * the buffer to the heap, growing geometrically so that a playlist with
+     * steadily lengthening lines does not reallocate on every line.
+     */
+    char stack_line_buf[LINE_BUF_STACK_SIZE];
+    char *line_buf = stack_line_buf;
+    size_t line_buf_size = sizeof(stack_line_buf);
+
+    /* Loop invariant, checked once rather than per tag line */
+    const int has_custom_tags_parser =
+        custom_tags_parser != Py_None && PyCallable_Check(custom_tags_parser);
 
     while (p < end) {
         ctx.lineno++;
 
-        /* Find end of line using memchr (often hardware-optimized) */
+        /* Find end of line (vectorized, see find_eol) */
         const char *line_start = p;
-        const char *eol = p;
-        while (eol < end && *eol != '\n' && *eol != '\r') {
-            eol++;
-        }
+        const char *eol = find_eol(p, end);
         Py_ssize_t line_len = eol - line_start;
 
         /* Strip leading whitespace */
@@ -2829,69 +3147,84 @@ m3u8_parse(PyObject *module, PyObject *args, PyObject *kwargs)
             continue;
         }
 
-        /* Grow line buffer if needed */
+        /*
+         * Non-comment line - segment or playlist URI. These are turned into
+         * a str straight from the input span; only tag lines, which the
+         * handlers read as C strings, are copied into the line buffer.
+         * Use shadow state for hot path checks (no dict lookups).
+         */
+        if (line_start[0] != '#') {
+            if (ctx.expect_segment) {
+                if (parse_ts_chunk(&ctx, line_start, line_len) < 0) {
+                    goto error;
+                }
+                ctx.expect_segment = 0;  /* parse_ts_chunk clears this */
+            } else if (ctx.expect_playlist) {
+                if (parse_variant_playlist(mod_state, line_start, line_len, data, state) < 0) {
+                    goto error;
+                }
+                ctx.expect_playlist = 0;  /* parse_variant_playlist clears this */
+            } else if (strict) {
+                raise_parse_error_len(mod_state, ctx.lineno, line_start, line_len);
+                goto error;
+            }
+            continue;
+        }
+
+        /* Grow line buffer if needed (contents need not be preserved) */
         if ((size_t)line_len + 1 > line_buf_size) {
-            line_buf_size = (size_t)line_len + 1;
-            char *new_buf = PyMem_Realloc(line_buf, line_buf_size);
+            size_t new_size = line_buf_size * 2;
+            if (new_size < (size_t)line_len + 1) {
+                new_size = (size_t)line_len + 1;
+            }
+            char *new_buf = PyMem_Malloc(new_size);
             if (new_buf == NULL) {
+                PyErr_NoMemory();
+                goto error;
+            }
+            if (line_buf != stack_line_buf) {
                 PyMem_Free(line_buf);
-                Py_DECREF(data);
-                Py_DECREF(state);
-                return PyErr_NoMemory();
             }
             line_buf = new_buf;
+            line_buf_size = new_size;
         }
 
         /* Copy stripped line to null-terminated buffer */
         memcpy(line_buf, line_start, line_len);
         line_buf[line_len] = '\0';
         char *stripped = line_buf;
+        ctx.line_len = line_len;
 
         /* Call custom tags parser if provided */
-        if (stripped[0] == '#' && custom_tags_parser != Py_None && PyCallable_Check(custom_tags_parser)) {
+        if (has_custom_tags_parser) {
             /* Sync shadow state to dict before callback (so it sees current state) */
             if (sync_shadow_to_dict(&ctx) < 0) {
-                PyMem_Free(line_buf);
-                Py_DECREF(data);
-                Py_DECREF(state);
-                return NULL;
+                goto error;
             }
-            PyObject *py_line = PyUnicode_FromString(stripped);
+            PyObject *py_line = PyUnicode_FromStringAndSize(stripped, line_len);
             PyObject *py_lineno = PyLong_FromLong(ctx.lineno);
             if (py_line == NULL || py_lineno == NULL) {
                 Py_XDECREF(py_line);
                 Py_XDECREF(py_lineno);
-                PyMem_Free(line_buf);
-                Py_DECREF(data);
-                Py_DECREF(state);
-                return NULL;
+                goto error;
             }
             PyObject *call_args = PyTuple_Pack(4, py_line, py_lineno, data, state);
             Py_DECREF(py_line);
             Py_DECREF(py_lineno);
             if (call_args == NULL) {
-                PyMem_Free(line_buf);
-                Py_DECREF(data);
-                Py_DECREF(state);
-                return NULL;
+                goto error;
             }
             PyObject *result = PyObject_Call(custom_tags_parser, call_args, NULL);
             Py_DECREF(call_args);
             if (!result) {
-                PyMem_Free(line_buf);
-                Py_DECREF(data);
-                Py_DECREF(state);
-                return NULL;
+                goto error;
             }
             /* Sync shadow state from dict (callback may have modified it) */
             sync_shadow_from_dict(&ctx);
             int truth = PyObject_IsTrue(result);
             Py_DECREF(result);
             if (truth < 0) {
-                PyMem_Free(line_buf);
-                Py_DECREF(data);
-                Py_DECREF(state);
-                return NULL;
+                goto error;
             }
             if (truth) {
                 /* p has already been advanced to the next line at the top of the loop */
@@ -2899,82 +3232,55 @@ m3u8_parse(PyObject *module, PyObject *args, PyObject *kwargs)
             }
         }
 
-        if (stripped[0] == '#') {
-            /*
-             * Tag dispatch using data-driven table lookup.
-             * This replaces ~400 lines of if/else strcmp chain with a clean loop.
-             * See TAG_DISPATCH table for the tag-to-handler mappings.
-             */
+        /*
+         * Tag dispatch using data-driven table lookup.
+         * This replaces ~400 lines of if/else strcmp chain with a clean loop.
+         * See TAG_DISPATCH table for the tag-to-handler mappings.
+         */
 
-            /* Handle #EXTM3U - just ignore it */
-            if (strncmp(stripped, EXT_M3U, sizeof(EXT_M3U)-1) == 0) {
-                continue;
-            }
+        /* Handle #EXTM3U - just ignore it */
+        if (strncmp(stripped, EXT_M3U, sizeof(EXT_M3U)-1) == 0) {
+            continue;
+        }
 
-            /* Dispatch to handler via table lookup */
-            int dispatch_result = dispatch_tag(&ctx, stripped, line_len);
-            if (dispatch_result < 0) {
-                /* Handler returned error */
-                PyMem_Free(line_buf);
-                Py_DECREF(data);
-                Py_DECREF(state);
-                return NULL;
-            }
-            if (dispatch_result == 0) {
-                /* Unknown tag - error in strict mode */
-                if (ctx.strict) {
-                    raise_parse_error(mod_state, ctx.lineno, stripped);
-                    PyMem_Free(line_buf);
-                    Py_DECREF(data);
-                    Py_DECREF(state);
-                    return NULL;
-                }
-            }
-        } else {
-            /* Non-comment line - segment or playlist URI */
-            /* Use shadow state for hot path checks (no dict lookups) */
-            if (ctx.expect_segment) {
-                if (parse_ts_chunk(mod_state, stripped, data, state) < 0) {
-                    PyMem_Free(line_buf);
-                    Py_DECREF(data);
-                    Py_DECREF(state);
-                    return NULL;
-                }
-                ctx.expect_segment = 0;  /* parse_ts_chunk clears this */
-            } else if (ctx.expect_playlist) {
-                if (parse_variant_playlist(mod_state, stripped, data, state) < 0) {
-                    PyMem_Free(line_buf);
-                    Py_DECREF(data);
-                    Py_DECREF(state);
-                    return NULL;
-                }
-                ctx.expect_playlist = 0;  /* parse_variant_playlist clears this */
-            } else if (strict) {
+        /* Dispatch to handler via table lookup */
+        int dispatch_result = dispatch_tag(&ctx, stripped, line_len);
+        if (dispatch_result < 0) {
+            /* Handler returned error */
+            goto error;
+        }
+        if (dispatch_result == 0) {
+            /* Unknown tag - error in strict mode */
+            if (ctx.strict) {
                 raise_parse_error(mod_state, ctx.lineno, stripped);
-                PyMem_Free(line_buf);
-                Py_DECREF(data);
-                Py_DECREF(state);
-                return NULL;
+                goto error;
             }
         }
         /* Loop continues with pointer already advanced */
     }
 
-    PyMem_Free(line_buf);
-
     /* Handle remaining partial segment - use interned strings */
     PyObject *segment = dict_get_interned(state, mod_state->str_segment);
     if (segment) {
         PyObject *segments = dict_get_interned(data, mod_state->str_segments);
         if (segments && PyList_Append(segments, segment) < 0) {
-            Py_DECREF(state);
-            Py_DECREF(data);
-            return NULL;
+            goto error;
         }
     }
 
+    if (line_buf != stack_line_buf) {
+        PyMem_Free(line_buf);
+    }
     Py_DECREF(state);
     return data;
+
+error:
+    if (line_buf != stack_line_buf) {
+        PyMem_Free(line_buf);
+    }
+    Py_DECREF(data);
+    Py_DECREF(state);
+    return NULL;
 }
 
 /* Module methods */
@@ -3027,6 +3333,9 @@ m3u8_parser_traverse(PyObject *module, visitproc visit, void *arg)
     Py_VISIT(state->datetime_cls);
     Py_VISIT(state->timedelta_cls);
     Py_VISIT(state->fromisoformat_meth);
+    Py_VISIT(state->validate_func);
+    Py_VISIT(state->last_delta);
+    Py_VISIT(state->data_template);
     #define VISIT_INTERNED(name, str) Py_VISIT(state->name);
     INTERNED_STRINGS(VISIT_INTERNED)
     #undef VISIT_INTERNED
@@ -3044,6 +3353,9 @@ m3u8_parser_clear(PyObject *module)
     Py_CLEAR(state->datetime_cls);
     Py_CLEAR(state->timedelta_cls);
     Py_CLEAR(state->fromisoformat_meth);
+    Py_CLEAR(state->validate_func);
+    Py_CLEAR(state->last_delta);
+    Py_CLEAR(state->data_template);
     #define CLEAR_INTERNED(name, str) Py_CLEAR(state->name);
     INTERNED_STRINGS(CLEAR_INTERNED)
     #undef CLEAR_INTERNED
@@ -3091,6 +3403,9 @@ PyInit__m3u8_parser(void)
     state->datetime_cls = NULL;
     state->timedelta_cls = NULL;
     state->fromisoformat_meth = NULL;
+    state->validate_func = NULL;
+    state->last_delta = NULL;
+    state->data_template = NULL;
     #define NULL_INTERNED(name, str) state->name = NULL;
     INTERNED_STRINGS(NULL_INTERNED)
     #undef NULL_INTERNED
@@ -3129,6 +3444,12 @@ PyInit__m3u8_parser(void)
         goto error;
     }
 
+    if (init_data_template(state) < 0) {
+        goto error;
+    }
+
+    init_tag_index(state);
+
     return m;
 
 error:
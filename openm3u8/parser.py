@@ -3,8 +3,10 @@
 # Use of this source code is governed by a MIT License
 # license that can be found in the LICENSE file.
 
+import functools
 import itertools
 import re
+import sys
 from datetime import datetime, timedelta
 
 try:
@@ -32,6 +34,13 @@ def format_date_time(value, **kwargs):
     return value.isoformat(**kwargs)
 
 
+@functools.lru_cache(maxsize=256)
+def _seconds_delta(seconds):
+    # Segment and part durations repeat across a playlist, so this saves
+    # building a timedelta for every one of them.
+    return timedelta(seconds=seconds)
+
+
 class ParseError(Exception):
     def __init__(self, lineno, line):
         self.lineno = lineno
@@ -82,8 +91,17 @@ def parse(content, strict=False, custom_tags_parser=None):
         if len(found_errors) > 0:
             raise Exception(found_errors)
 
+    # Loop invariants, bound once rather than looked up per line
+    has_custom_tags_parser = callable(custom_tags_parser)
+    dispatch_get = DISPATCH.get
+
     for lineno, line in enumerate(lines, 1):
         line = line.strip()
+
+        # Blank lines are ignored.
+        if not line:
+            continue
+
         parse_kwargs = {
             "line": line,
             "lineno": lineno,
@@ -92,23 +110,19 @@ def parse(content, strict=False, custom_tags_parser=None):
             "strict": strict,
         }
 
-        # Blank lines are ignored.
-        if not line:
-            continue
+        if line[0] == "#":
+            # Call custom parser if needed
+            if has_custom_tags_parser:
+                go_to_next_line = custom_tags_parser(line, lineno, data, state)
 
-        # Call custom parser if needed
-        if line.startswith("#") and callable(custom_tags_parser):
-            go_to_next_line = custom_tags_parser(line, lineno, data, state)
+                # Do not try to parse other standard tags on this line if custom_tags_parser
+                # function returns `True`
+                if go_to_next_line:
+                    continue
 
-            # Do not try to parse other standard tags on this line if custom_tags_parser
-            # function returns `True`
-            if go_to_next_line:
-                continue
-
-        # Fast-path: dispatch based on tag token up to first ':' (or full tag if none)
-        if line.startswith("#"):
+            # Fast-path: dispatch based on tag token up to first ':' (or full tag if none)
             tag = line.split(":", 1)[0]
-            handler = DISPATCH.get(tag)
+            handler = dispatch_get(tag)
             if handler is not None:
                 handler(**parse_kwargs)
                 continue
@@ -136,15 +150,21 @@ def parse(content, strict=False, custom_tags_parser=None):
     return data
 
 
-def _parse_key(line, data, state, **kwargs):
-    params = ATTRIBUTELISTPATTERN.split(line.replace(protocol.ext_x_key + ":", ""))[
-        1::2
-    ]
+def _parse_key_attributes(prefix, line):
+    params = ATTRIBUTELISTPATTERN.split(line.replace(prefix + ":", ""))[1::2]
     key = {}
     for param in params:
         name, value = param.split("=", 1)
-        key[normalize_attribute(name)] = remove_quotes(value)
+        name = normalize_attribute(name)
+        value = remove_quotes(value)
+        if name in INTERNED_KEY_ATTRIBUTES:
+            value = sys.intern(value)
+        key[name] = value
+    return key
 
+
+def _parse_key(line, data, state, **kwargs):
+    key = _parse_key_attributes(protocol.ext_x_key, line)
     state["current_key"] = key
     if key not in data["keys"]:
         data["keys"].append(key)
@@ -173,7 +193,7 @@ def _parse_ts_chunk(line, data, state, **kwargs):
         segment["program_date_time"] = state.pop("program_date_time")
     if state.get("current_program_date_time"):
         segment["current_program_date_time"] = state["current_program_date_time"]
-        state["current_program_date_time"] += timedelta(seconds=segment["duration"])
+        state["current_program_date_time"] += _seconds_delta(segment["duration"])
     segment["uri"] = line
     segment["cue_in"] = state.pop("cue_in", False)
     segment["cue_out"] = state.pop("cue_out", False)
@@ -206,25 +226,24 @@ def _parse_ts_chunk(line, data, state, **kwargs):
 
 
 def _parse_attribute_list(prefix, line, attribute_parser, default_parser=None):
-    params = ATTRIBUTELISTPATTERN.split(line.replace(prefix + ":", ""))[1::2]
-
+    prefix += ":"
     attributes = {}
-    if not line.startswith(prefix + ":"):
+    if not line.startswith(prefix):
         return attributes
 
+    params = ATTRIBUTELISTPATTERN.split(line.replace(prefix, ""))[1::2]
+    # One lookup per attribute; unknown names fall back to default_parser
+    get_parser = attribute_parser.get
+
     for param in params:
-        param_parts = param.split("=", 1)
-        if len(param_parts) == 1:
-            name = ""
-            value = param_parts[0]
-        else:
-            name, value = param_parts
+        name, sep, value = param.partition("=")
+        if not sep:
+            name, value = "", name
 
         name = normalize_attribute(name)
-        if name in attribute_parser:
-            value = attribute_parser[name](value)
-        elif default_parser is not None:
-            value = default_parser(value)
+        parser = get_parser(name, default_parser)
+        if parser is not None:
+            value = parser(value)
 
         attributes[name] = value
 
@@ -240,28 +259,27 @@ def _parse_stream_inf(line, data, state, **kwargs):
     )
 
 
+def _parse_uri_stream_inf(prefix, line, playlists, info_key):
+    stream_info = _parse_attribute_list(prefix, line, URI_STREAM_INF_ATTRIBUTE_PARSER)
+    playlists.append({"uri": stream_info.pop("uri"), info_key: stream_info})
+
+
 def _parse_i_frame_stream_inf(line, data, **kwargs):
-    iframe_stream_info = _parse_attribute_list(
-        protocol.ext_x_i_frame_stream_inf, line, IFRAME_STREAM_INF_ATTRIBUTE_PARSER
+    _parse_uri_stream_inf(
+        protocol.ext_x_i_frame_stream_inf,
+        line,
+        data["iframe_playlists"],
+        "iframe_stream_info",
     )
-    iframe_playlist = {
-        "uri": iframe_stream_info.pop("uri"),
-        "iframe_stream_info": iframe_stream_info,
-    }
-
-    data["iframe_playlists"].append(iframe_playlist)
 
 
 def _parse_image_stream_inf(line, data, **kwargs):
-    image_stream_info = _parse_attribute_list(
-        protocol.ext_x_image_stream_inf, line, IMAGE_STREAM_INF_ATTRIBUTE_PARSER
+    _parse_uri_stream_inf(
+        protocol.ext_x_image_stream_inf,
+        line,
+        data["image_playlists"],
+        "image_stream_info",
     )
-    image_playlist = {
-        "uri": image_stream_info.pop("uri"),
-        "image_stream_info": image_stream_info,
-    }
-
-    data["image_playlists"].append(image_playlist)
 
 
 def _parse_is_images_only(line, data, **kwargs):
@@ -494,7 +512,7 @@ def _parse_part(line, state, **kwargs):
     # this should always be true according to spec
     if state.get("current_program_date_time"):
         part["program_date_time"] = state["current_program_date_time"]
-        state["current_program_date_time"] += timedelta(seconds=part["duration"])
+        state["current_program_date_time"] += _seconds_delta(part["duration"])
 
     part["dateranges"] = state.pop("dateranges", None)
     part["gap_tag"] = state.pop("gap", None)
@@ -522,14 +540,7 @@ def _parse_session_data(line, data, **kwargs):
 
 
 def _parse_session_key(line, data, **kwargs):
-    params = ATTRIBUTELISTPATTERN.split(
-        line.replace(protocol.ext_x_session_key + ":", "")
-    )[1::2]
-    key = {}
-    for param in params:
-        name, value = param.split("=", 1)
-        key[normalize_attribute(name)] = remove_quotes(value)
-    data["session_keys"].append(key)
+    data["session_keys"].append(_parse_key_attributes(protocol.ext_x_session_key, line))
 
 
 def _parse_preload_hint(line, data, **kwargs):
@@ -578,6 +589,10 @@ def remove_quotes_parser(*attrs):
     return dict(zip(attrs, itertools.repeat(remove_quotes)))
 
 
+def interned_remove_quotes_parser(*attrs):
+    return dict(zip(attrs, itertools.repeat(remove_quotes_interned)))
+
+
 def remove_quotes(string):
     """
     Remove quotes from string.
@@ -594,7 +609,18 @@ def remove_quotes(string):
     return string
 
 
+def remove_quotes_interned(string):
+    """
+    remove_quotes() for values drawn from a small, repeating set
+    (CODECS, GROUP-ID, ...): equal values share one interned str.
+    """
+    return sys.intern(remove_quotes(string))
+
+
+@functools.lru_cache(maxsize=1024)
 def normalize_attribute(attribute):
+    # Attribute names come from a small vocabulary, so cache them; every
+    # parsed dict then shares one key object per name.
     return attribute.replace("-", "_").lower().strip()
 
 
@@ -624,15 +650,15 @@ def save_segment_custom_value(state, key, value):
     state["segment"]["custom_parser_values"][key] = value
 
 
-# Attribute parser constants (built once)
-STREAM_INF_ATTRIBUTE_PARSER = remove_quotes_parser(
-    "codecs",
-    "audio",
-    "video",
-    "video_range",
-    "subtitles",
-    "pathway_id",
-    "stable_variant_id",
+# Attribute parser constants (built once). Attributes with a small set of
+# values that repeats across a playlist have them interned.
+INTERNED_KEY_ATTRIBUTES = frozenset(("method", "keyformat", "keyformatversions"))
+
+STREAM_INF_ATTRIBUTE_PARSER = interned_remove_quotes_parser(
+    "codecs", "audio", "video", "video_range", "subtitles"
+)
+STREAM_INF_ATTRIBUTE_PARSER.update(
+    remove_quotes_parser("pathway_id", "stable_variant_id")
 )
 STREAM_INF_ATTRIBUTE_PARSER.update(
     {
@@ -640,46 +666,37 @@ STREAM_INF_ATTRIBUTE_PARSER.update(
         "bandwidth": lambda x: int(float(x)),
         "average_bandwidth": int,
         "frame_rate": float,
-        "hdcp_level": str,
+        "hdcp_level": sys.intern,
     }
 )
 
-IFRAME_STREAM_INF_ATTRIBUTE_PARSER = remove_quotes_parser(
-    "codecs", "uri", "pathway_id", "stable_variant_id"
+# EXT-X-I-FRAME-STREAM-INF and EXT-X-IMAGE-STREAM-INF share one schema
+URI_STREAM_INF_ATTRIBUTE_PARSER = interned_remove_quotes_parser("codecs")
+URI_STREAM_INF_ATTRIBUTE_PARSER.update(
+    remove_quotes_parser("uri", "pathway_id", "stable_variant_id")
 )
-IFRAME_STREAM_INF_ATTRIBUTE_PARSER.update(
+URI_STREAM_INF_ATTRIBUTE_PARSER.update(
     {
         "program_id": int,
         "bandwidth": int,
         "average_bandwidth": int,
-        "hdcp_level": str,
+        "hdcp_level": sys.intern,
+        "resolution": str,
     }
 )
+IFRAME_STREAM_INF_ATTRIBUTE_PARSER = URI_STREAM_INF_ATTRIBUTE_PARSER
+IMAGE_STREAM_INF_ATTRIBUTE_PARSER = URI_STREAM_INF_ATTRIBUTE_PARSER
 
-IMAGE_STREAM_INF_ATTRIBUTE_PARSER = remove_quotes_parser(
-    "codecs", "uri", "pathway_id", "stable_variant_id"
+MEDIA_ATTRIBUTE_PARSER = interned_remove_quotes_parser(
+    "group_id", "language", "assoc_language", "characteristics", "channels"
 )
-IMAGE_STREAM_INF_ATTRIBUTE_PARSER.update(
-    {
-        "program_id": int,
-        "bandwidth": int,
-        "average_bandwidth": int,
-        "resolution": str,
-    }
+MEDIA_ATTRIBUTE_PARSER.update(
+    remove_quotes_parser(
+        "uri", "name", "instream_id", "stable_rendition_id", "thumbnails", "image"
+    )
 )
-
-MEDIA_ATTRIBUTE_PARSER = remove_quotes_parser(
-    "uri",
-    "group_id",
-    "language",
-    "assoc_language",
-    "name",
-    "instream_id",
-    "characteristics",
-    "channels",
-    "stable_rendition_id",
-    "thumbnails",
-    "image",
+MEDIA_ATTRIBUTE_PARSER.update(
+    dict.fromkeys(("type", "default", "autoselect", "forced"), sys.intern)
 )
 
 X_MAP_ATTRIBUTE_PARSER = remove_quotes_parser("uri", "byterange")
@@ -701,7 +718,12 @@ RENDITION_REPORT_ATTRIBUTE_PARSER.update({"last_msn": int, "last_part": int})
 
 PART_ATTRIBUTE_PARSER = remove_quotes_parser("uri")
 PART_ATTRIBUTE_PARSER.update(
-    {"duration": lambda x: float(x), "independent": str, "gap": str, "byterange": str}
+    {
+        "duration": lambda x: float(x),
+        "independent": sys.intern,
+        "gap": sys.intern,
+        "byterange": str,
+    }
 )
 
 SKIP_ATTRIBUTE_PARSER = remove_quotes_parser("recently_removed_dateranges")
@@ -713,17 +735,16 @@ SESSION_DATA_ATTRIBUTE_PARSER = remove_quotes_parser(
 
 PRELOAD_HINT_ATTRIBUTE_PARSER = remove_quotes_parser("uri")
 PRELOAD_HINT_ATTRIBUTE_PARSER.update(
-    {"type": str, "byterange_start": int, "byterange_length": int}
+    {"type": sys.intern, "byterange_start": int, "byterange_length": int}
 )
 
-DATERANGE_ATTRIBUTE_PARSER = remove_quotes_parser(
-    "id", "class", "start_date", "end_date"
-)
+DATERANGE_ATTRIBUTE_PARSER = interned_remove_quotes_parser("class")
+DATERANGE_ATTRIBUTE_PARSER.update(remove_quotes_parser("id", "start_date", "end_date"))
 DATERANGE_ATTRIBUTE_PARSER.update(
     {
         "duration": float,
         "planned_duration": float,
-        "end_on_next": str,
+        "end_on_next": sys.intern,
         "scte35_cmd": str,
         "scte35_out": str,
         "scte35_in": str,
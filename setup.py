@@ -28,6 +28,14 @@ if (
     # For local editable installs, keep it optional so pure-Python fallback works
     is_wheel_build = "CIBUILDWHEEL" in os.environ
 
+    # The parser is one translation unit, so LTO has nothing to inline across.
+    # -O3 regardless of the interpreter's own CFLAGS; on Linux, call the
+    # libpython API through the GOT rather than PLT stubs and export only
+    # PyInit. Wheels must run on baseline CPUs, so no -march.
+    extra_compile_args = ["-O3"]
+    if sys.platform == "linux":
+        extra_compile_args += ["-fno-plt", "-fvisibility=hidden"]
+
     ext_modules.append(
         Extension(
             "openm3u8._m3u8_parser",
@@ -35,7 +43,13 @@ if (
             optional=not is_wheel_build,  # Required for wheels, optional otherwise
             py_limited_api=True,
             define_macros=[("Py_LIMITED_API", PY_LIMITED_API)],
+            extra_compile_args=extra_compile_args,
         )
     )
 
-setup(ext_modules=ext_modules)
+# Tag wheels abi3 so one cp310 wheel installs on every later CPython
+options = {}
+if ext_modules:
+    options["bdist_wheel"] = {"py_limited_api": "cp310"}
+
+setup(ext_modules=ext_modules, options=options)
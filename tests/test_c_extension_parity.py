@@ -128,6 +128,224 @@ def test_custom_tags_parser_mutating_keys_fails_cleanly():
         )
 
 
+def test_custom_tags_parser_removing_none_key_matches_python():
+    content = "\n".join(
+        [
+            "#EXTM3U",
+            "#EXTINF:1,",
+            "a.ts",
+            "#EXT-X-CUSTOM-TAG",
+            "#EXTINF:1,",
+            "b.ts",
+        ]
+    )
+
+    def custom_tags_parser(line, lineno, data, state):
+        if line == "#EXT-X-CUSTOM-TAG":
+            data["keys"].remove(None)
+            return True
+        return False
+
+    assert c_parser.parse(
+        content, custom_tags_parser=custom_tags_parser
+    ) == py_parser.parse(content, custom_tags_parser=custom_tags_parser)
+
+
 def test_embedded_nul_is_rejected_at_c_parser_boundary():
     with pytest.raises(ValueError, match="embedded null bytes"):
         c_parser.parse("#EXTM3U\n#EXT-X-VERSION:3\0#EXT-X-TARGETDURATION:8")
+
+
+def test_lines_longer_than_line_buffer_match_python():
+    # Lengths straddle the C parser's on-stack line buffer so the heap
+    # fallback and its regrowth are exercised, including a short line after.
+    lines = ["#EXTM3U", "#EXT-X-TARGETDURATION:8"]
+    for length in (10, 1023, 1024, 1025, 5000, 3000, 20000, 12):
+        lines.append("#EXTINF:8," + "t" * length)
+        lines.append("https://example.com/" + "u" * length + ".ts")
+    content = "\n".join(lines)
+
+    assert c_parser.parse(content) == py_parser.parse(content)
+
+
+@pytest.mark.parametrize("strict", [False, True])
+def test_tags_sharing_a_prefix_dispatch_like_python(strict):
+    content = "\n".join(
+        [
+            "#EXTM3U",
+            "#EXT-X-TARGETDURATION:8",
+            "# plain comment",
+            "#EXT",
+            "#EXT-X-",
+            "#EXT-X-PARTX:URI=a.mp4",
+            "#EXT-X-PART-INFO:PART-TARGET=1",
+            "#EXT-X-PART-INF:PART-TARGET=1",
+            "#EXT-X-CUE-OUT-CONTX",
+            "#EXT-X-CUE-OUT-CONT:ElapsedTime=1,Duration=2",
+            "#EXTINFO:8,",
+            "#EXTINF:8,",
+            "file.ts",
+        ]
+    )
+
+    def run(parse):
+        try:
+            return parse(content, strict=strict)
+        except py_parser.ParseError as e:
+            return ("error", e.lineno, e.line)
+
+    assert run(c_parser.parse) == run(py_parser.parse)
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n", "\r"])
+def test_line_splitting_at_every_offset_matches_python(newline):
+    # Vary URI lengths so line terminators land at every position within
+    # the C parser's 8/16/32-byte scanning blocks.
+    lines = ["#EXTM3U", "#EXT-X-TARGETDURATION:8"]
+    for length in range(1, 70):
+        lines.append("#EXTINF:8,")
+        lines.append("s" * length)
+    content = newline.join(lines) + newline
+
+    assert c_parser.parse(content) == py_parser.parse(content)
+    assert c_parser.parse(content, strict=True) == py_parser.parse(content, strict=True)
+
+
+def test_key_attribute_quotes_are_removed_like_python():
+    content = "\n".join(
+        [
+            "#EXTM3U",
+            "#EXT-X-TARGETDURATION:8",
+            "#EXT-X-SESSION-KEY:METHOD=AES-128,URI=\"https://k/s\",IV='0x1'",
+            "#EXT-X-KEY:METHOD=AES-128,URI=\"https://k/1\",KEYFORMAT='identity'",
+            "#EXTINF:8,",
+            "a.ts",
+            "#EXT-X-KEY:METHOD=NONE",
+            "#EXTINF:8,",
+            "c.ts",
+        ]
+    )
+
+    assert c_parser.parse(content) == py_parser.parse(content)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "0",
+        "007",
+        "12345678",
+        "123456789012345678",
+        "1234567890123456789012",
+        "9007199254740993",
+        "10.010",
+        "-2.5",
+        "+3",
+        ".5",
+        "5.",
+        "0.1000000000000000055511151231257827",
+        "1e3",
+    ],
+)
+def test_numeric_values_convert_like_python(value):
+    # Integer-only fields make the Python parser raise on anything else.
+    int_value = value if value.isdigit() else "1"
+    content = "\n".join(
+        [
+            "#EXTM3U",
+            f"#EXT-X-MEDIA-SEQUENCE:{int_value}",
+            f"#EXT-X-PART-INF:PART-TARGET={value}",
+            f"#EXTINF:{value},",
+            "a.ts",
+            f"#EXT-X-STREAM-INF:BANDWIDTH={value},PROGRAM-ID={int_value},"
+            f"FRAME-RATE={value}",
+            "v.m3u8",
+        ]
+    )
+
+    assert c_parser.parse(content) == py_parser.parse(content)
+
+
+def test_program_date_time_advances_like_python_with_changing_durations():
+    lines = ["#EXTM3U", "#EXT-X-PROGRAM-DATE-TIME:2024-01-01T00:00:00.000+00:00"]
+    for duration in ("6.006", "6.006", "4.5", "6.006", "0.000001", "4.5"):
+        lines.append(f"#EXTINF:{duration},")
+        lines.append("a.ts")
+    content = "\n".join(lines)
+
+    c = c_parser.parse(content)
+    assert c == py_parser.parse(content)
+    assert c_parser.parse(content) == c
+
+
+def test_custom_tags_parser_sees_and_edits_pending_segment_flags():
+    content = "\n".join(
+        [
+            "#EXTM3U",
+            "#EXT-X-DISCONTINUITY",
+            "#EXT-X-CUE-IN",
+            "#EXT-X-GAP",
+            "#EXT-X-DROP-CUE-IN",
+            "#EXTINF:1,",
+            "a.ts",
+            "#EXT-X-ADD-DISCONTINUITY",
+            "#EXT-X-CUE-OUT:DURATION=30",
+            "#EXTINF:1,",
+            "b.ts",
+        ]
+    )
+
+    def run(parse):
+        seen = []
+
+        def custom_tags_parser(line, lineno, data, state):
+            seen.append(
+                sorted(
+                    k
+                    for k in ("discontinuity", "cue_in", "gap", "cue_out_start")
+                    if k in state
+                )
+            )
+            if line == "#EXT-X-DROP-CUE-IN":
+                del state["cue_in"]
+                return True
+            if line == "#EXT-X-ADD-DISCONTINUITY":
+                state["discontinuity"] = True
+                return True
+            return False
+
+        return parse(content, custom_tags_parser=custom_tags_parser), seen
+
+    assert run(c_parser.parse) == run(py_parser.parse)
+
+
+@pytest.mark.parametrize("content", ["", "   ", "\n\r\n \t\n"])
+@pytest.mark.parametrize("strict", [False, True])
+def test_blank_content_matches_python(content, strict):
+    c = c_parser.parse(content, strict=strict)
+    py = py_parser.parse(content, strict=strict)
+    assert c == py
+    assert list(c) == list(py)
+
+
+@pytest.mark.parametrize("parse", [c_parser and c_parser.parse, py_parser.parse])
+def test_repeated_enumerated_values_share_one_object(parse):
+    content = "\n".join(
+        [
+            "#EXTM3U",
+            '#EXT-X-MEDIA:TYPE=AUDIO,GROUP-ID="aud",LANGUAGE="en",URI="a1.m3u8"',
+            '#EXT-X-MEDIA:TYPE=AUDIO,GROUP-ID="aud",LANGUAGE="en",URI="a2.m3u8"',
+            '#EXT-X-STREAM-INF:BANDWIDTH=1,CODECS="avc1.4d401f,mp4a.40.2"',
+            "v1.m3u8",
+            '#EXT-X-STREAM-INF:BANDWIDTH=2,CODECS="avc1.4d401f,mp4a.40.2"',
+            "v2.m3u8",
+        ]
+    )
+
+    data = parse(content)
+    first, second = data["media"]
+    assert first["type"] is second["type"]
+    assert first["group_id"] is second["group_id"]
+    assert first["language"] is second["language"]
+    codecs = [p["stream_info"]["codecs"] for p in data["playlists"]]
+    assert codecs[0] is codecs[1]